@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+归档往返测试：devlog archive 删除原文件前，归档必须能原样读回
+
+  1. 生成 --days 天语料（其中一天改为 CRLF 换行），记录 list（每天）/ report / export 的输出
+  2. archive --older-than N：原文件已删除、归档成员与原文件逐字节相同、各命令输出不变
+  3. 向已归档的某天追加新条目（另含一条与归档内容相同的条目，应被防重跳过），
+     读取时归档部分与新文件合并；之后换一个新的 Logger（相当于新的 CLI 进程）单独再写一条归档中的条目，
+     仍应被跳过；再次 archive 后成员 = 原归档 + 新文件，输出仍不变
+
+Usage:
+    python3 benchmarks/archive_roundtrip.py [--days 60] [--entries 20] [--older-than 7]
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import sys
+import tempfile
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import corpus  # noqa: E402
+from devlog import Config, Logger, archive_path, scan_day_files  # noqa: E402
+
+
+def captured(func, *args, **kwargs):
+    """返回 func 打印到 stdout 的内容"""
+    return run_quiet(func, *args, **kwargs)[1]
+
+
+def run_quiet(func, *args, **kwargs):
+    """返回 (func 的返回值, 打印到 stdout 的内容)"""
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        result = func(*args, **kwargs)
+    return result, buf.getvalue()
+
+
+def snapshot(logger, base_dir, dates, export_file):
+    """每天的 list、全范围 report 与 export 的输出"""
+    out = {f"list {date_str}": captured(logger.list_today, False, base_dir, date_str=date_str) for date_str in dates}
+    out["report"] = captured(logger.generate_report, since=min(dates), custom_dir=base_dir)
+    captured(logger.export, "jsonl", output=export_file, custom_dir=base_dir)
+    with open(export_file, "r", encoding="utf-8") as f:
+        out["export"] = f.read()
+    return out
+
+
+def member(base_dir, date_str):
+    with zipfile.ZipFile(archive_path(base_dir, date_str)) as zf:
+        return zf.read(f"{date_str}.md")
+
+
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--entries", type=int, default=20, help="每天条目数")
+    parser.add_argument("--older-than", type=int, default=7)
+    args = parser.parse_args()
+
+    results = []
+
+    def check(name, ok, detail=""):
+        results.append(ok)
+        print(f"{'OK  ' if ok else 'FAIL'}  {name}{f'  ({detail})' if detail and not ok else ''}")
+
+    logger = Logger(config=Config(auto_init=False))
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = os.path.join(tmp, "logs")
+        export_file = os.path.join(tmp, "export.jsonl")
+        corpus.generate(base_dir, args.days, args.entries)
+        dates = sorted(scan_day_files(base_dir))
+        cutoff = (datetime.date.today() - datetime.timedelta(days=args.older_than)).strftime("%Y-%m-%d")
+        archived = [date_str for date_str in dates if date_str < cutoff]
+        if len(archived) < 2:
+            print("corpus too small: need at least two days older than --older-than")
+            return 1
+
+        # 一天改成 CRLF 换行：归档必须逐字节保留
+        crlf_day, target = archived[0], archived[-1]
+        crlf_file = os.path.join(base_dir, f"{crlf_day}.md")
+        data = read_bytes(crlf_file).replace(b"\n", b"\r\n")
+        with open(crlf_file, "wb") as f:
+            f.write(data)
+
+        originals = {date_str: read_bytes(os.path.join(base_dir, f"{date_str}.md")) for date_str in archived}
+        before = snapshot(logger, base_dir, dates, export_file)
+
+        # 第一次打包
+        code, _ = run_quiet(logger.archive, args.older_than, custom_dir=base_dir)
+        check("archive exit code", code == 0, f"code={code}")
+        left = [d for d in archived if os.path.exists(os.path.join(base_dir, f"{d}.md"))]
+        check(f"archive removed {len(archived)} day files", not left, f"{len(left)} left")
+        changed = [d for d in archived if member(base_dir, d) != originals[d]]
+        check("archive members byte-identical (incl. CRLF day)", not changed, ", ".join(changed))
+        after = snapshot(logger, base_dir, dates, export_file)
+        diff = [key for key in before if before[key] != after.get(key)]
+        check("list / report / export unchanged after archive", not diff, ", ".join(diff[:5]))
+
+        # 向已归档的一天追加：一条新条目 + 一条与归档内容重复的条目
+        existing = next(iter(logger.iter_log_entries(os.path.join(base_dir, f"{target}.md"))))
+        records = [
+            logger.normalize_record({"category": "feat", "title": "written after archive", "date": target,
+                                     "time": "23:59", "project": "@roundtrip"}),
+            logger.normalize_record({"category": existing["category"], "title": existing["title"],
+                                     "date": target, "time": "23:59", "project": "@roundtrip"}),
+        ]
+        imported, skipped = logger.append_entries(base_dir, records)
+        check("write to archived day: new entry kept, archived duplicate skipped",
+              (imported, skipped) == (1, 1), f"imported={imported} skipped={skipped}")
+        # 单独一次调用、新的进程内缓存：防重依赖 sidecar，须仍包含归档部分的哈希
+        archived_items = list(logger.iter_log_entries(os.path.join(base_dir, f"{target}.md")))
+        again = Logger(config=Config(auto_init=False)).append_entries(base_dir, [
+            logger.normalize_record({"category": archived_items[1]["category"], "title": archived_items[1]["title"],
+                                     "date": target, "time": "23:59", "project": "@roundtrip"}),
+        ])
+        check("separate write after first write to archived day: archived duplicate skipped",
+              again == (0, 1), f"imported={again[0]} skipped={again[1]}")
+        new_file = read_bytes(os.path.join(base_dir, f"{target}.md"))
+        merged = snapshot(logger, base_dir, dates, export_file)
+        check("list shows archived + new entries", "written after archive" in merged[f"list {target}"])
+
+        # 第二次打包：新文件并入已有归档
+        code, _ = run_quiet(logger.archive, args.older_than, custom_dir=base_dir)
+        check("second archive exit code", code == 0, f"code={code}")
+        check("second archive removed the new day file", not os.path.exists(os.path.join(base_dir, f"{target}.md")))
+        check("member = previous archive + new file", member(base_dir, target) == originals[target] + new_file)
+        final = snapshot(logger, base_dir, dates, export_file)
+        diff = [key for key in merged if merged[key] != final.get(key)]
+        check("list / report / export unchanged after re-archive", not diff, ", ".join(diff[:5]))
+
+    print(f"\n{sum(results)}/{len(results)} checks passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+并发写入压力测试：多进程同时向同一天的日志追加
+
+检查项：
+  - 只有一个 `# 📅` 表头
+  - 每个条目的标题行与细节行完整相邻，没有交错
+  - 所有进程都写相同标题时，每个标题只落盘一次
+并输出单进程与多进程的写入吞吐（entries/s）
+
+Usage:
+    python3 benchmarks/bench_concurrent_write.py [--procs 16] [--entries 200]
+"""
+
+import argparse
+import contextlib
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from devlog import Config, Logger  # noqa: E402
+
+
+def worker(base_dir, worker_id, count, shared_titles, barrier):
+    logger = Logger(config=Config(auto_init=False))
+    barrier.wait()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for i in range(count):
+            title = f"shared #{i}" if shared_titles else f"worker {worker_id} #{i}"
+            logger.write("feat", title, f"line-a {worker_id}/{i}\nline-b {worker_id}/{i}", False, base_dir)
+
+
+def run(procs, count, shared_titles):
+    """返回 (耗时秒, 日志文件路径, 临时目录)"""
+    tmp = tempfile.TemporaryDirectory()
+    barrier = multiprocessing.Barrier(procs + 1)
+    workers = [
+        multiprocessing.Process(target=worker, args=(tmp.name, n, count, shared_titles, barrier))
+        for n in range(procs)
+    ]
+    for p in workers:
+        p.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for p in workers:
+        p.join()
+    elapsed = time.perf_counter() - start
+    files = [f for f in os.listdir(tmp.name) if f.endswith(".md")]
+    return elapsed, os.path.join(tmp.name, files[0]), tmp
+
+
+def verify(filepath, expected_titles):
+    """校验文件结构，返回错误列表"""
+    errors = []
+    with open(filepath, "r", encoding="utf-8") as f:
+        lines = f.read().split("\n")
+
+    headers = [line for line in lines if line.startswith("# 📅")]
+    if len(headers) != 1:
+        errors.append(f"expected 1 day header, found {len(headers)}")
+
+    titles = []
+    for i, line in enumerate(lines):
+        if not line.startswith("### "):
+            continue
+        title = line.split("FEAT: ", 1)[1]
+        titles.append(title)
+        if title.startswith("worker"):
+            tag = title.split(" ", 1)[1].replace(" #", "/")
+            if lines[i + 1] != f"> line-a {tag}" or lines[i + 2] != f"> line-b {tag}":
+                errors.append(f"interleaved entry: {title}")
+        elif not (lines[i + 1].startswith("> line-a") and lines[i + 2].startswith("> line-b")):
+            errors.append(f"interleaved entry: {title}")
+
+    if sorted(titles) != sorted(expected_titles):
+        errors.append(f"expected {len(expected_titles)} entries, found {len(titles)} "
+                      f"({len(titles) - len(set(titles))} duplicates)")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--procs", type=int, default=16)
+    parser.add_argument("--entries", type=int, default=200, help="每个进程写入的条目数")
+    args = parser.parse_args()
+
+    failed = False
+    baseline, _, tmp = run(1, args.entries, False)
+    tmp.cleanup()
+    print(f"1 process    : {args.entries / baseline:8.0f} entries/s")
+
+    for shared in (False, True):
+        elapsed, filepath, tmp = run(args.procs, args.entries, shared)
+        if shared:
+            expected = [f"shared #{i}" for i in range(args.entries)]
+            label = "shared titles"
+        else:
+            expected = [f"worker {n} #{i}" for n in range(args.procs) for i in range(args.entries)]
+            label = "unique titles"
+        errors = verify(filepath, expected)
+        total = args.procs * args.entries
+        print(f"{args.procs} processes, {label}: {total / elapsed:8.0f} attempts/s, "
+              f"{len(expected)} entries  {'OK' if not errors else 'FAILED'}")
+        for error in errors[:10]:
+            print(f"  - {error}")
+        failed = failed or bool(errors)
+        tmp.cleanup()
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+近似重复检测基准：LSH 分桶查询 vs 逐条比较整个回看窗口
+
+在 --days × --entries 的窗口上：
+  - 冷启动同步（为全部条目计算 MinHash 签名）耗时
+  - 每次检查的平均耗时与候选条目数（LSH）/ 窗口条目总数（逐条比较）
+  - 召回：对已有条目稍作改写（加字、换标点）后能否被识别
+另测写入路径：在当天日志不断增长时逐条 Logger.write，对比开启 / 关闭检测的每次写入耗时，
+开启时的耗时不应随当天已有条目数线性增长
+
+Usage:
+    python3 benchmarks/bench_near_dup.py [--days 30] [--entries 100] [--queries 200] [--writes 3000]
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import corpus  # noqa: E402
+from devlog import Config, Logger, NearDupIndex  # noqa: E402
+
+
+def perturb(rng, text):
+    """模拟换个说法再记一次：随机插入一个词、替换一个标点"""
+    words = text.split()
+    words.insert(rng.randrange(len(words) + 1), rng.choice(corpus.CJK_WORDS))
+    return " ".join(words).replace("#", "No.", 1)
+
+
+def write_growth(writes, checkpoints):
+    """
+    向空目录逐条写入 writes 条（当天文件随之增长），返回 {near_dup: {检查点: 该段平均 ms/write}}
+    检查点为当天已有条目数，每段取其前 50 次写入的平均值
+    """
+    results = {}
+    for near_dup in ("0", "1"):
+        os.environ["DEVLOG_NEAR_DUP"] = near_dup
+        rng = random.Random(2)
+        logger = Logger(config=Config(auto_init=False))
+        timings = []
+        with tempfile.TemporaryDirectory() as base_dir, open(os.devnull, "w") as devnull, \
+                contextlib.redirect_stdout(devnull):
+            for i in range(writes):
+                title = f"{corpus.make_text(rng, 6, 0.6)} #{i}"
+                detail = corpus.make_text(rng, 12, 0.6)
+                start = time.perf_counter()
+                logger.write("feat", title, detail, False, base_dir)
+                timings.append(time.perf_counter() - start)
+        results[near_dup] = {
+            n: sum(timings[n:n + 50]) / len(timings[n:n + 50]) * 1000 for n in checkpoints if n < writes
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--entries", type=int, default=100, help="每天条目数")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--writes", type=int, default=3000, help="写入路径测试的写入条数")
+    args = parser.parse_args()
+    os.environ["DEVLOG_DURABILITY"] = "none"
+
+    rng = random.Random(1)
+    logger = Logger(config=Config(auto_init=False))
+    with tempfile.TemporaryDirectory() as base_dir:
+        corpus.generate(base_dir, args.days, args.entries, detail_lines=1)
+        index = NearDupIndex(base_dir, logger, args.threshold, args.days)
+
+        start = time.perf_counter()
+        index.sync()
+        cold = time.perf_counter() - start
+        rows = index.conn.execute("SELECT date, title, sig FROM sigs").fetchall()
+        total = len(rows)
+
+        items = [
+            (date_str, item)
+            for date_str in sorted({row[0] for row in rows})
+            for item in logger.load_day(base_dir, date_str)
+        ]
+        samples = rng.sample(items, min(args.queries, len(items)))
+
+        lsh_time = brute_time = 0.0
+        candidates = hits = 0
+        for date_str, item in samples:
+            title, detail = perturb(rng, item["title"]), item["detail"]
+
+            start = time.perf_counter()
+            match = index.find(item["category"], title, detail, date_str)
+            lsh_time += time.perf_counter() - start
+            hits += bool(match)
+            buckets = NearDupIndex.bands(NearDupIndex.signature(f"{title} {detail}"))
+            candidates += index.conn.execute(
+                f"SELECT COUNT(DISTINCT key) FROM buckets WHERE bucket IN ({', '.join('?' * len(buckets))})",
+                buckets,
+            ).fetchone()[0]
+
+            start = time.perf_counter()
+            sig = NearDupIndex.signature(f"{title} {detail}")
+            for _, _, blob in rows:
+                other = array("I")
+                other.frombytes(blob)
+                sum(1 for x, y in zip(sig, other) if x == y)
+            brute_time += time.perf_counter() - start
+        index.close()
+
+    n = len(samples)
+    print(f"window      : {total} entries ({args.days} days x {args.entries})")
+    print(f"cold sync   : {cold:.2f} s")
+    print(f"LSH check   : {lsh_time / n * 1000:7.2f} ms/query, {candidates / n:8.1f} candidates")
+    print(f"brute force : {brute_time / n * 1000:7.2f} ms/query, {total:8d} comparisons")
+    print(f"recall      : {hits}/{n} reworded entries flagged at threshold {args.threshold}")
+
+    checkpoints = [0, 300, 1000, 3000, 10000]
+    growth = write_growth(args.writes, checkpoints)
+    print(f"\n{'entries today':>14}{'check off':>12}{'check on':>12}   (ms/write)")
+    for cp in growth["1"]:
+        print(f"{cp:>14}{growth['0'][cp]:>12.2f}{growth['1'][cp]:>12.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
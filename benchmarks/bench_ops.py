@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+devlog 热路径基准：ops/sec 与峰值内存
+
+覆盖操作：
+  write          Logger.write（含加锁、防重检查、追加）
+  parse_log_file 解析单个日志文件
+  list_today     输出当天日志
+  weekly         generate_weekly（默认 7 天）
+  weekly_long    generate_weekly（--long-days，默认 365 天）
+  export         export --format jsonl 全量导出（峰值内存应与语料大小无关）
+
+计时与内存分开测量（tracemalloc 会拖慢执行）。可用 --save 保存结果，
+之后用 --compare 对比，任一操作 ops/sec 下降超过 --tolerance 时退出码为 1。
+
+Usage:
+    python3 benchmarks/bench_ops.py [--days 365] [--entries 50] [--writes 500]
+    python3 benchmarks/bench_ops.py --days 10000 --entries 100 --save baseline.json
+    python3 benchmarks/bench_ops.py --days 10000 --entries 100 --compare baseline.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import corpus  # noqa: E402
+from devlog import Config, Logger  # noqa: E402
+
+
+def measure(func, repeat):
+    """返回 (ops/sec, 峰值内存字节)"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        func()  # 预热（索引、缓存等）
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return repeat / elapsed, peak
+
+
+def run(args):
+    results = {}
+    logger = Logger(config=Config(auto_init=False))
+    today = datetime.date.today().strftime("%Y-%m-%d")
+
+    with tempfile.TemporaryDirectory() as archive, tempfile.TemporaryDirectory() as scratch:
+        start = time.perf_counter()
+        files, entries, size = corpus.generate(
+            archive, args.days, args.entries, args.detail_lines, cjk_ratio=args.cjk_ratio,
+        )
+        print(f"corpus: {files} files, {entries} entries, {size / 1024 / 1024:.1f} MB "
+              f"(generated in {time.perf_counter() - start:.1f}s)")
+        today_file = os.path.join(archive, f"{today}.md")
+
+        # write: 每次调用写入新标题，文件随之增长
+        counter = iter(range(10 ** 9))
+
+        def write():
+            n = next(counter)
+            logger.write("feat", f"基准写入 #{n}", f"detail {n}", False, scratch)
+
+        results["write"] = measure(write, args.writes)
+        results["parse_log_file"] = measure(lambda: logger.parse_log_file(today_file), args.repeat)
+        results["list_today"] = measure(lambda: logger.list_today(False, archive), args.repeat)
+        results["weekly"] = measure(lambda: logger.generate_weekly(7, False, archive), args.repeat)
+        long_days = min(args.long_days, args.days)
+        results["weekly_long"] = measure(
+            lambda: logger.generate_weekly(long_days, False, archive), max(1, args.repeat // 10),
+        )
+        results["export"] = measure(
+            lambda: logger.export("jsonl", custom_dir=archive), max(1, args.repeat // 10),
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--entries", type=int, default=50, help="每天条目数")
+    parser.add_argument("--detail-lines", type=int, default=2)
+    parser.add_argument("--cjk-ratio", type=float, default=0.6)
+    parser.add_argument("--writes", type=int, default=500, help="write 调用次数")
+    parser.add_argument("--repeat", type=int, default=20, help="其余操作的重复次数")
+    parser.add_argument("--long-days", type=int, default=365)
+    parser.add_argument("--save", metavar="FILE", help="保存结果为 JSON")
+    parser.add_argument("--compare", metavar="FILE", help="与之前保存的结果对比")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="允许的 ops/sec 下降比例")
+    args = parser.parse_args()
+
+    results = run(args)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    regressions = []
+    print(f"{'operation':<16}{'ops/sec':>12}{'peak mem':>12}{'vs baseline':>14}")
+    for name, (ops, peak) in results.items():
+        delta = ""
+        if name in baseline:
+            ratio = ops / baseline[name]["ops_per_sec"]
+            delta = f"{(ratio - 1) * 100:+.0f}%"
+            if ratio < 1 - args.tolerance:
+                regressions.append(name)
+        print(f"{name:<16}{ops:>12.1f}{peak / 1024 / 1024:>10.2f}MB{delta:>14}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({name: {"ops_per_sec": ops, "peak_bytes": peak} for name, (ops, peak) in results.items()},
+                      f, indent=2)
+    if regressions:
+        print(f"REGRESSION: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
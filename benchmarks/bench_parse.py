@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+parse_log_file 吞吐基准：旧版逐分类扫描解析 vs 单正则流式解析
+
+Usage:
+    python3 benchmarks/bench_parse.py [--mb 8] [--repeat 3]
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from devlog import Config, Logger  # noqa: E402
+
+
+def legacy_parse_log_file(filepath):
+    """旧版实现（逐分类 in/split + 两次未编译 re.search），仅用于对比"""
+    entries = {cat: [] for cat in Logger.CATEGORIES.keys()}
+    with open(filepath, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+
+    current_detail = []
+    current_entry = None
+    for line in lines:
+        if line.startswith("### "):
+            if current_entry:
+                entries[current_entry["category"]].append({
+                    "title": current_entry["title"],
+                    "time": current_entry["time"],
+                    "project": current_entry["project"],
+                    "detail": "\n".join(current_detail).strip()
+                })
+            current_entry = None
+            current_detail = []
+            for cat in Logger.CATEGORIES.keys():
+                cat_pattern = f"{cat.upper()}: "
+                if cat_pattern in line:
+                    title = line.split(cat_pattern)[1].strip()
+                    current_entry = {"category": cat, "title": title, "time": "未知", "project": "未知"}
+                    time_match = re.search(r'\[(\d{2}:\d{2})\]', line)
+                    if time_match:
+                        current_entry["time"] = time_match.group(1)
+                    proj_match = re.search(r'`(@[^`]+)`', line)
+                    if proj_match:
+                        current_entry["project"] = proj_match.group(1)
+                    break
+        elif line.startswith("> ") and current_entry:
+            current_detail.append(line[2:].strip())
+    if current_entry:
+        entries[current_entry["category"]].append({
+            "title": current_entry["title"],
+            "time": current_entry["time"],
+            "project": current_entry["project"],
+            "detail": "\n".join(current_detail).strip()
+        })
+    return entries
+
+
+# 手工编辑的标题写法，旧解析器能识别，新解析器必须保持兼容
+COMPAT_HEADERS = [
+    "### [14:30] `@p` FEAT: 标准格式",
+    "### 14:31 BUG: 时间没有方括号",
+    "### [14:32] @p INCIDENT: 项目没有反引号",
+    "### OPS: 没有时间和项目",
+    "### [09:00]  `@p`   DESIGN: 多余空格",
+    "### 📌 LEARN: 分类前有其他文字",
+]
+
+
+def check_compat(logger, tmp):
+    """旧格式兼容：COMPAT_HEADERS 的解析结果须与旧版一致"""
+    filepath = os.path.join(tmp, "2025-01-20.md")
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write("# 📅 2025-01-20 Work Log\n\n")
+        for header in COMPAT_HEADERS:
+            f.write(f"{header}\n> detail\n\n")
+    legacy = legacy_parse_log_file(filepath)
+    current = {
+        cat: [{k: v for k, v in item.items() if k != "category"} for item in items]
+        for cat, items in logger.parse_log_file(filepath).items()
+    }
+    parsed = sum(len(items) for items in current.values())
+    assert current == legacy, f"compat headers: {current} != {legacy}"
+    return parsed
+
+
+def write_day_file(filepath, target_bytes):
+    """生成一个约 target_bytes 大小的日志文件，返回条目数"""
+    cats = list(Logger.CATEGORIES.keys())
+    count = 0
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write("# 📅 2025-01-21 Work Log\n\n")
+        while f.tell() < target_bytes:
+            cat = cats[count % len(cats)]
+            f.write(f"### [{count // 60 % 24:02d}:{count % 60:02d}] `@project-{count % 13}` "
+                    f"{cat.upper()}: 首页Crash 修复 #{count}\n")
+            f.write("> Root Cause: NPE in FeedAdapter.notifyDataSetChanged()\n")
+            f.write("> Fix: 添加空值检查，已提交 PR\n\n")
+            count += 1
+    return count
+
+
+def bench(func, filepath, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(filepath)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=8, help="日志文件大小 (MB)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logger = Logger(config=Config(auto_init=False))
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = os.path.join(tmp, "2025-01-21.md")
+        count = write_day_file(filepath, int(args.mb * 1024 * 1024))
+        size_mb = os.path.getsize(filepath) / 1024 / 1024
+
+        assert legacy_parse_log_file(filepath) == {
+            cat: [{k: v for k, v in item.items() if k != "category"} for item in items]
+            for cat, items in logger.parse_log_file(filepath).items()
+        }
+
+        compat = check_compat(logger, tmp)
+
+        legacy = bench(legacy_parse_log_file, filepath, args.repeat)
+        current = bench(logger.parse_log_file, filepath, args.repeat)
+
+    print(f"compat: {compat}/{len(COMPAT_HEADERS)} hand-edited headers parsed as before")
+    print(f"file: {size_mb:.1f} MB, {count} entries")
+    print(f"legacy   : {legacy * 1000:8.1f} ms  {size_mb / legacy:7.1f} MB/s  {count / legacy:10.0f} entries/s")
+    print(f"streaming: {current * 1000:8.1f} ms  {size_mb / current:7.1f} MB/s  {count / current:10.0f} entries/s")
+    print(f"speedup  : {legacy / current:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
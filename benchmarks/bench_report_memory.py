@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+报告管线内存基准：dict 条目模型 vs 列式 EntryTable
+
+在 --days × --entries 的语料上（默认 1000 × 100 = 10 万条）：
+  dict model   旧的汇总结构：每条一个 dict，再包成 (date_str, item) 元组按分类放进列表
+  EntryTable   列式表：整数列用 array，分类 / 项目 / 时间驻留，不为每条建对象
+两者消费同一个逐天解析的条目流，分别统计解析 + 装载耗时、峰值内存与装载后常驻内存；
+最后给出 Logger.generate_report 全程（解析 + 汇总 + 输出）的耗时与峰值内存
+
+Usage:
+    python3 benchmarks/bench_report_memory.py [--days 1000] [--entries 100] [--detail-lines 2]
+"""
+
+import argparse
+import contextlib
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import corpus  # noqa: E402
+from devlog import Config, EntryTable, Logger, scan_day_files  # noqa: E402
+
+
+def parsed_days(logger, base_dir):
+    """逐天产出 (date_str, [item, ...])，与 load_days 的消费方式一致"""
+    for date_str in sorted(scan_day_files(base_dir)):
+        yield date_str, list(logger.iter_log_entries(os.path.join(base_dir, f"{date_str}.md")))
+
+
+def build_dicts(days):
+    all_entries = {cat: [] for cat in Logger.CATEGORIES}
+    for date_str, items in days:
+        for item in items:
+            all_entries[item["category"]].append((date_str, item))
+    return all_entries
+
+
+def build_table(days):
+    table = EntryTable()
+    for date_str, items in days:
+        table.add_day(date_str, items)
+    return table
+
+
+def measure(build, days_factory):
+    """返回 (耗时秒, 峰值字节, 常驻字节)；耗时与内存分开测（tracemalloc 会拖慢执行）"""
+    gc.collect()
+    start = time.perf_counter()
+    result = build(days_factory())
+    elapsed = time.perf_counter() - start
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = build(days_factory())
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=1000)
+    parser.add_argument("--entries", type=int, default=100, help="每天条目数")
+    parser.add_argument("--detail-lines", type=int, default=2)
+    args = parser.parse_args()
+
+    logger = Logger(config=Config(auto_init=False))
+    with tempfile.TemporaryDirectory() as base_dir:
+        files, entries, size = corpus.generate(base_dir, args.days, args.entries, args.detail_lines)
+        print(f"corpus: {files} files, {entries} entries, {size / 1024 / 1024:.1f} MB")
+
+        # 两种模型都从头解析（含解析本身的临时分配），与报告的真实路径一致
+        results = {
+            "dict model": measure(build_dicts, lambda: parsed_days(logger, base_dir)),
+            "EntryTable": measure(build_table, lambda: parsed_days(logger, base_dir)),
+        }
+
+        print(f"\n{'aggregate':<14}{'parse+build':>13}{'peak':>12}{'retained':>12}{'per entry':>12}")
+        for name, (elapsed, peak, retained) in results.items():
+            print(f"{name:<14}{elapsed * 1000:>11.0f}ms{peak / 1024 / 1024:>10.1f}MB"
+                  f"{retained / 1024 / 1024:>10.1f}MB{retained / entries:>11.0f}B")
+        dict_peak, table_peak = results["dict model"][1], results["EntryTable"][1]
+        print(f"peak reduction: {(1 - table_peak / dict_peak) * 100:.0f}%")
+
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            logger.generate_report(custom_dir=base_dir)
+            elapsed = time.perf_counter() - start
+            gc.collect()
+            tracemalloc.start()
+            logger.generate_report(custom_dir=base_dir)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        print(f"\ngenerate_report over {entries} entries: {elapsed:.2f} s, peak {peak / 1024 / 1024:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+写入命令启动耗时预算检查
+
+  - 中位数墙钟时间：`devlog <category> <title>` 相对空解释器（python -c pass）的额外耗时
+    （同时给出直接运行 devlog.py 的耗时作对比：脚本本身每次都要重新编译）
+  - `python -X importtime`：写入快速路径不得导入 argparse / re / json / sqlite3 / socket，
+    且导入总耗时不超过预算
+超出预算时退出码为 1，可直接用于 CI
+
+Usage:
+    python3 benchmarks/bench_startup.py [--runs 20] [--budget-ms 35] [--import-budget-ms 25]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+LAUNCHER = os.path.join(ROOT, "devlog")
+SCRIPT = os.path.join(ROOT, "devlog.py")
+# 写入快速路径禁止导入的模块
+FORBIDDEN = ("argparse", "re", "json", "sqlite3", "socket", "pathlib")
+
+
+def median_runtime(cmd, env, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def import_profile(cmd, env):
+    """返回 ({module: 累计微秒}, 总自身耗时微秒)"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime"] + cmd, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True,
+    )
+    modules, total = {}, 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative_us)
+        total += int(self_us)
+    return modules, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=35, help="相对空解释器的额外墙钟时间预算")
+    parser.add_argument("--import-budget-ms", type=float, default=25, help="-X importtime 总导入耗时预算")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        config_dir = os.path.join(home, ".claude", "skills", "devlog")
+        log_dir = os.path.join(home, "logs")
+        os.makedirs(config_dir)
+        with open(os.path.join(config_dir, ".config"), "w", encoding="utf-8") as f:
+            json.dump({"global_dir": log_dir, "version": "1.0"}, f)
+        env = dict(os.environ, HOME=home, DEVLOG_NO_DAEMON="1")
+        env.pop("DEVLOG_GLOBAL_DIR", None)
+        env.pop("PYTHONDONTWRITEBYTECODE", None)  # 按真实安装测量：允许写 __pycache__
+
+        counter = iter(range(10 ** 9))
+
+        def write_cmd(entry=LAUNCHER):
+            return [entry, "feat", f"startup {next(counter)}", "-d", "detail"]
+
+        def write_overhead_ms(entry):
+            samples = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                subprocess.run([sys.executable] + write_cmd(entry), env=env, stdout=subprocess.DEVNULL, check=True)
+                samples.append(time.perf_counter() - start)
+            return (statistics.median(samples) - baseline) * 1000
+
+        baseline = median_runtime([sys.executable, "-c", "pass"], env, args.runs)
+        write_overhead_ms(LAUNCHER)  # 预热 __pycache__
+        overhead_ms = write_overhead_ms(LAUNCHER)
+        script_overhead_ms = write_overhead_ms(SCRIPT)
+
+        # 导入检查用环境变量给出所有写入相关设置，排除配置文件 JSON 解析
+        modules, total_us = import_profile(
+            write_cmd(), dict(env, DEVLOG_GLOBAL_DIR=log_dir, DEVLOG_DURABILITY="none"),
+        )
+
+    forbidden = [name for name in FORBIDDEN if name in modules]
+    import_ms = total_us / 1000
+
+    print(f"interpreter baseline : {baseline * 1000:7.1f} ms")
+    print(f"write overhead       : {overhead_ms:7.1f} ms  (budget {args.budget_ms:.0f} ms)")
+    print(f"  via devlog.py      : {script_overhead_ms:7.1f} ms")
+    print(f"import time (total)  : {import_ms:7.1f} ms  (budget {args.import_budget_ms:.0f} ms)")
+    print(f"forbidden imports    : {', '.join(forbidden) or 'none'}")
+
+    ok = overhead_ms <= args.budget_ms and import_ms <= args.import_budget_ms and not forbidden
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+合成日志语料生成器
+
+按 devlog 的真实格式生成 YYYY-MM-DD.md：
+    # 📅 2025-01-21 Work Log
+
+    ### [14:30] `@project` CATEGORY: title
+    > detail
+
+可配置天数、每天条目数、细节行数/长度以及中文比例，供各基准脚本复用。
+
+Usage:
+    python3 benchmarks/corpus.py OUT_DIR [--days 365] [--entries 50] [--detail-lines 2]
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from devlog import Logger  # noqa: E402
+
+CJK_WORDS = [
+    "首页", "崩溃", "缓存", "点赞", "评论", "折叠", "支付", "超时", "登录", "重构",
+    "方案", "用户中心", "数据订正", "配置变更", "慢查询", "连接池", "灰度", "回滚", "埋点", "推送",
+]
+LATIN_WORDS = [
+    "Feed", "Crash", "NPE", "cache", "TTL", "adapter", "token", "timeout", "retry", "index",
+    "Redis", "MySQL", "Kafka", "API", "SDK", "build", "deploy", "review", "refactor", "hotfix",
+]
+PROJECTS = [f"@service-{i}" for i in range(8)] + ["@Weibo_Project", "@Global", "@infra"]
+
+
+def make_text(rng, words, cjk_ratio):
+    """拼接 words 个词，cjk_ratio 控制中文词的比例（中文词之间不加空格）"""
+    parts = []
+    for _ in range(words):
+        if rng.random() < cjk_ratio:
+            parts.append(rng.choice(CJK_WORDS))
+        else:
+            parts.append(" " + rng.choice(LATIN_WORDS) + " ")
+    return " ".join("".join(parts).split())
+
+
+def day_text(rng, date_str, entries, detail_lines=2, detail_words=12, cjk_ratio=0.6):
+    """生成一天的日志文本"""
+    categories = list(Logger.CATEGORIES.keys())
+    minutes = sorted(rng.randrange(24 * 60) for _ in range(entries))
+    lines = [f"# 📅 {date_str} Work Log", ""]
+    for n, minute in enumerate(minutes):
+        category = rng.choice(categories)
+        title = f"{make_text(rng, rng.randint(2, 5), cjk_ratio)} #{n}"
+        lines.append(f"### [{minute // 60:02d}:{minute % 60:02d}] `{rng.choice(PROJECTS)}` "
+                     f"{category.upper()}: {title}")
+        for _ in range(detail_lines):
+            lines.append(f"> {make_text(rng, detail_words, cjk_ratio)}")
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def generate(out_dir, days, entries, detail_lines=2, detail_words=12, cjk_ratio=0.6,
+             end=None, seed=0):
+    """
+    在 out_dir 生成截至 end（默认今天）的 days 天日志
+    返回 (文件数, 条目总数, 总字节数)
+    """
+    rng = random.Random(seed)
+    end = end or datetime.date.today()
+    os.makedirs(out_dir, exist_ok=True)
+    total_bytes = 0
+    for i in range(days):
+        date_str = (end - datetime.timedelta(days=i)).strftime("%Y-%m-%d")
+        text = day_text(rng, date_str, entries, detail_lines, detail_words, cjk_ratio)
+        data = text.encode("utf-8")
+        with open(os.path.join(out_dir, f"{date_str}.md"), "wb") as f:
+            f.write(data)
+        total_bytes += len(data)
+    return days, days * entries, total_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--entries", type=int, default=50, help="每天条目数")
+    parser.add_argument("--detail-lines", type=int, default=2, help="每条细节行数")
+    parser.add_argument("--detail-words", type=int, default=12, help="每行细节词数")
+    parser.add_argument("--cjk-ratio", type=float, default=0.6, help="中文词比例 0~1")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    files, entries, size = generate(
+        args.out_dir, args.days, args.entries, args.detail_lines,
+        args.detail_words, args.cjk_ratio, seed=args.seed,
+    )
+    print(f"{files} files, {entries} entries, {size / 1024 / 1024:.1f} MB -> {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
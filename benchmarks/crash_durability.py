@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+崩溃安全测试：各 durability 策略下，哪些条目能在进程被 SIGKILL 后保留
+
+子进程用长驻模式（enable_write_behind）逐条写入，每次 write 返回后通知父进程（acked）；
+同时记录每次 fsync 时日志文件的大小。父进程收到 --kill-after 个确认后 SIGKILL 子进程，
+再解析日志文件，统计：
+  acked      write 已返回的条目数
+  on disk    被杀后文件中存在的条目数（进程崩溃后仍在）
+  lost       已确认却不在文件中的条目（group-commit 队列中尚未写入的部分）
+  fsynced    完整位于最后一次 fsync 范围内的条目（断电也不会丢）
+
+期望：none 与 fsync-per-entry 不丢已确认条目，none 没有 fsync；fsync-per-entry 的已确认条目全部 fsync；
+group-commit 写入文件的条目都已 fsync，丢失的只是最后一个窗口内尚未写入的条目。
+
+Usage:
+    python3 benchmarks/crash_durability.py [--writes 1000] [--kill-after 500] [--window-ms 50] [--batch 64]
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import signal
+import stat
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from devlog import DURABILITY_MODES, Config, Logger  # noqa: E402
+
+
+def child(base_dir, config_file, writes, report_fd):
+    real_fsync = os.fsync
+
+    def traced_fsync(fd):
+        real_fsync(fd)
+        st = os.fstat(fd)
+        if stat.S_ISREG(st.st_mode):
+            os.write(report_fd, f"F {st.st_size}\n".encode())
+
+    os.fsync = traced_fsync
+
+    config = Config(auto_init=False)
+    config.config_file = config_file
+    logger = Logger(config=config)
+    logger.enable_write_behind()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for i in range(writes):
+            logger.write("feat", f"entry #{i}", "", False, base_dir)
+            os.write(report_fd, f"A {i}\n".encode())
+    time.sleep(3600)  # 等待被杀
+
+
+def entry_ends(filepath):
+    """返回 {条目序号: 该条目在文件中的结束字节偏移}"""
+    ends = {}
+    offset = 0
+    current = None
+    try:
+        with open(filepath, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return ends
+    for line in data.splitlines(keepends=True):
+        offset += len(line)
+        text = line.decode("utf-8", errors="replace")
+        if text.startswith("### "):
+            current = int(text.rsplit("#", 1)[1])
+            ends[current] = offset
+    return ends
+
+
+def run(mode, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = os.path.join(tmp, "config.json")
+        with open(config_file, "w", encoding="utf-8") as f:
+            json.dump({
+                "durability": mode,
+                "group_commit_ms": args.window_ms,
+                "group_commit_entries": args.batch,
+            }, f)
+        base_dir = os.path.join(tmp, "logs")
+        os.makedirs(base_dir)
+
+        read_fd, write_fd = os.pipe()
+        proc = multiprocessing.Process(target=child, args=(base_dir, config_file, args.writes, write_fd))
+        start = time.perf_counter()
+        proc.start()
+        os.close(write_fd)
+
+        acked = -1
+        fsynced_size = 0
+        buf = b""
+        with os.fdopen(read_fd, "rb", buffering=0) as pipe:
+            while acked + 1 < args.kill_after:
+                chunk = pipe.read(4096)
+                if not chunk:
+                    break
+                buf += chunk
+                *lines, buf = buf.split(b"\n")
+                for line in lines:
+                    kind, value = line.split()
+                    if kind == b"A":
+                        acked = int(value)
+                    else:
+                        fsynced_size = max(fsynced_size, int(value))
+            elapsed = time.perf_counter() - start
+            os.kill(proc.pid, signal.SIGKILL)
+            proc.join()
+            # 被杀前已写进管道的 fsync 记录也要算上
+            for line in (buf + pipe.read()).split(b"\n"):
+                if line.startswith(b"F "):
+                    fsynced_size = max(fsynced_size, int(line.split()[1]))
+
+        files = [name for name in os.listdir(base_dir) if name.endswith(".md")]
+        ends = entry_ends(os.path.join(base_dir, files[0])) if files else {}
+        acked_ids = set(range(acked + 1))
+        return {
+            "acked": len(acked_ids),
+            "on_disk": len(ends),
+            "lost": len(acked_ids - ends.keys()),
+            "fsynced": sum(1 for end in ends.values() if end <= fsynced_size),
+            "rate": (acked + 1) / elapsed,
+        }
+
+
+def check(mode, r):
+    """返回违反预期的说明"""
+    problems = []
+    if mode in ("none", "fsync-per-entry") and r["lost"]:
+        problems.append(f"{r['lost']} acknowledged entries lost")
+    if mode == "none" and r["fsynced"]:
+        problems.append("unexpected fsync")
+    if mode == "fsync-per-entry" and r["fsynced"] < r["acked"]:
+        problems.append(f"only {r['fsynced']} of {r['acked']} acknowledged entries fsynced")
+    if mode == "group-commit" and r["fsynced"] < r["on_disk"]:
+        problems.append(f"{r['on_disk'] - r['fsynced']} entries on disk but not fsynced")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writes", type=int, default=1000)
+    parser.add_argument("--kill-after", type=int, default=500, help="收到多少个写入确认后 SIGKILL")
+    parser.add_argument("--window-ms", type=int, default=50, help="group-commit 时间窗口")
+    parser.add_argument("--batch", type=int, default=64, help="group-commit 最多条目数")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'mode':<18}{'acked':>7}{'on disk':>9}{'lost':>6}{'fsynced':>9}{'writes/s':>10}  result")
+    for mode in DURABILITY_MODES:
+        r = run(mode, args)
+        problems = check(mode, r)
+        failed = failed or bool(problems)
+        print(f"{mode:<18}{r['acked']:>7}{r['on_disk']:>9}{r['lost']:>6}{r['fsynced']:>9}{r['rate']:>10.0f}  "
+              f"{'; '.join(problems) or 'OK'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
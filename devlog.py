@@ -7,34 +7,527 @@ Usage:
     devlog incident "首页Crash" -d "NPE in FeedAdapter"
     devlog feat "点赞功能" --here
     devlog design "缓存策略" --path ~/custom/path
+
+Python API（进程内调用，见 DevLog）:
+    from devlog import DevLog
+    with DevLog() as log:
+        log.write("feat", "点赞功能", detail="...")
 """
 
+# 写入是最常见的调用，启动开销以它为准：顶层只导入轻量模块，
+# re / json / argparse / sqlite3 / socket 等在用到时再导入
+import time
+
+_IMPORT_START = time.perf_counter()
+
 import os
 import sys
 import datetime
-import argparse
-import re
-import json
-from pathlib import Path
+import hashlib
+
+try:
+    import fcntl
+except ImportError:  # Windows 无 fcntl，退化为无锁追加
+    fcntl = None
 
 # ================= Configuration =================
 # 配置文件路径
 CONFIG_DIR = os.path.expanduser("~/.claude/skills/devlog")
 CONFIG_FILE = os.path.join(CONFIG_DIR, ".config")
+# 守护进程 socket 路径（可用环境变量 DEVLOG_SOCKET 覆盖）
+SOCKET_FILE = os.path.join(CONFIG_DIR, "devlog.sock")
 # 项目本地存储目录名（隐藏目录，避免污染）
 LOCAL_DIR_NAME = ".devlog"
+# 派生数据目录名（索引、缓存），位于日志目录内，可随时删除重建
+CACHE_DIR_NAME = ".devlog-cache"
+# 写入持久化策略（配置项 durability）
+DURABILITY_MODES = ("none", "fsync-per-entry", "group-commit")
+# 日志文件名: YYYY-MM-DD.md
+DAY_FILE_PATTERN = r"^(\d{4}-\d{2}-\d{2})\.md$"
+# 月度归档目录与文件名: archive/YYYY-MM.zip（每天一个成员 YYYY-MM-DD.md）
+ARCHIVE_DIR_NAME = "archive"
+ARCHIVE_FILE_PATTERN = r"^(\d{4}-\d{2})\.zip$"
 # ================================================
 
+# 搜索分词：CJK 连续段切成二元组（单字保留），其余按单词切分
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+TOKEN_PATTERN = f"([{_CJK}]+)|([^\\W_{_CJK}]+)"
+
+_compiled = {}
+
+
+def _regex(pattern):
+    """按需导入 re 并缓存编译结果"""
+    compiled = _compiled.get(pattern)
+    if compiled is None:
+        import re
+        compiled = _compiled[pattern] = re.compile(pattern)
+    return compiled
+
+
+def ensure_dir(path):
+    """目录已存在时只做一次 stat，不再 mkdir"""
+    if not os.path.isdir(path):
+        os.makedirs(path, exist_ok=True)
+
+
+class Profiler:
+    """
+    分阶段计时
+    --profile 时在 stderr 打印耗时分解，DEVLOG_PROFILE=path 时把结果追加为一行 JSON
+    阶段可以嵌套，耗时包含子阶段；未启用时只多一次属性判断
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.show = False
+        self.sink = None
+        self.command = None
+        self.phases = {}  # {name: [seconds, calls]}
+        self._start = None
+
+    def start(self, show=False, sink=None):
+        self.enabled = True
+        self.show = show
+        self.sink = sink
+        self.phases = {}
+        self._start = time.perf_counter()
+
+    def add(self, name, seconds):
+        stat = self.phases.setdefault(name, [0.0, 0])
+        stat[0] += seconds
+        stat[1] += 1
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def finish(self, exit_code):
+        """输出结果并停止计时"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        total_ms = (time.perf_counter() - self._start) * 1000
+        phases = {name: (seconds * 1000, calls) for name, (seconds, calls) in self.phases.items()}
+
+        if self.show:
+            print(f"\n⏱️  Profile: {self.command or '-'}  total {total_ms:.2f} ms", file=sys.stderr)
+            for name, (ms, calls) in sorted(phases.items(), key=lambda item: -item[1][0]):
+                print(f"  {name:<16}{ms:>10.2f} ms  x{calls}", file=sys.stderr)
+
+        if self.sink:
+            import json
+
+            record = {
+                "ts": datetime.datetime.now().isoformat(timespec="milliseconds"),
+                "pid": os.getpid(),
+                "command": self.command,
+                "exit_code": exit_code,
+                "total_ms": round(total_ms, 3),
+                "phases": {name: {"ms": round(ms, 3), "calls": calls} for name, (ms, calls) in phases.items()},
+            }
+            try:
+                with open(self.sink, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            except OSError as e:
+                print(f"Warning: Failed to write profile - {e}", file=sys.stderr)
+
+
+class _Phase:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self.start)
+
+
+PROFILER = Profiler()
+
+
+def profiled(name):
+    """装饰器：启用计时时把函数耗时计入 name 阶段"""
+    def decorate(func):
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            with PROFILER.phase(name):
+                return func(*args, **kwargs)
+        wrapper.__name__ = func.__name__
+        wrapper.__qualname__ = func.__qualname__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+    return decorate
+
+
+def tokenize(text, query=False):
+    """
+    CJK 感知分词，返回 token 集合
+    建索引时 CJK 段同时产出单字和二元组；查询时只在单字段使用单字，
+    这样 "首页Crash" 会拆成 {"首页", "crash"}
+    """
+    tokens = set()
+    for cjk, word in _regex(TOKEN_PATTERN).findall(text.lower()):
+        if word:
+            tokens.add(word)
+            continue
+        if len(cjk) == 1 or not query:
+            tokens.update(cjk)
+        tokens.update(cjk[i:i + 2] for i in range(len(cjk) - 1))
+    return tokens
+
+
+class LockedAppend:
+    """
+    以 O_APPEND 打开日志文件并加独占建议锁（flock），with 块内得到文件描述符
+    同一时刻只有一个进程能做 防重检查 + 追加，关闭时自动释放锁
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.fd = None
+
+    @profiled("lock")
+    def __enter__(self):
+        while True:
+            self.fd = os.open(self.filepath, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                if not fcntl:
+                    return self.fd
+                fcntl.flock(self.fd, fcntl.LOCK_EX)
+                # 等锁期间文件可能已被归档删除，此时重新打开，避免写进已删除的文件
+                if os.fstat(self.fd).st_ino == os.stat(self.filepath).st_ino:
+                    return self.fd
+            except FileNotFoundError:
+                pass
+            except OSError:
+                os.close(self.fd)
+                raise
+            os.close(self.fd)
+
+    def __exit__(self, *exc):
+        os.close(self.fd)
+
+
+def fsync_dir(path):
+    """fsync 目录，使新建的文件名本身也落盘"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def append_atomic(fd, text):
+    """把整段文本作为一次 write 追加（极少数短写时继续写完剩余部分）"""
+    data = text.encode("utf-8")
+    while data:
+        written = os.write(fd, data)
+        data = data[written:]
+
+
+def scan_day_files(base_dir, archived=True):
+    """
+    扫描日志目录，返回 {date_str: (mtime_ns, size)}
+    archived=True 时包含月度归档中的日子（与未归档的同日文件合并）
+    """
+    stamps = {}
+    match_name = _regex(DAY_FILE_PATTERN).match
+    try:
+        with os.scandir(base_dir) as it:
+            for entry in it:
+                match = match_name(entry.name)
+                if match and entry.is_file():
+                    st = entry.stat()
+                    stamps[match.group(1)] = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        pass
+    if archived:
+        for date_str, stamp in scan_archived_days(base_dir).items():
+            stamps[date_str] = _merge_stamps(stamp, stamps.get(date_str))
+    return stamps
+
+
+def _merge_stamps(archived, loose):
+    """同一天既有归档又有 .md 文件时合并为一个校验值"""
+    if not archived or not loose:
+        return archived or loose
+    return (max(archived[0], loose[0]), archived[1] + loose[1])
+
+
+def day_stamp(base_dir, date_str):
+    """一天日志的 (mtime_ns, size)，包含归档部分；都不存在时返回 None"""
+    archived = None
+    cached = _open_archive(archive_path(base_dir, date_str))
+    if cached and date_str in cached[2]:
+        archived = (cached[0][0], cached[2][date_str].file_size)
+    try:
+        st = os.stat(os.path.join(base_dir, f"{date_str}.md"))
+    except OSError:
+        return archived
+    return _merge_stamps(archived, (st.st_mtime_ns, st.st_size))
+
+
+# ================= Archive =================
+# 已打开的月度归档: {zip 路径: ((mtime_ns, size), ZipFile, {date_str: ZipInfo})}
+_archives = {}
+
+
+def archive_path(base_dir, date_str):
+    """某天（或某月 YYYY-MM）所属的月度归档路径"""
+    return os.path.join(base_dir, ARCHIVE_DIR_NAME, f"{date_str[:7]}.zip")
+
+
+def _open_archive(path):
+    """
+    打开月度归档并缓存其中央目录（即每天成员的偏移表）
+    之后读取任意一天只需 seek 到该成员解压，归档文件变化时重新打开
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        _archives.pop(path, None)
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _archives.get(path)
+    if cached and cached[0] == stamp:
+        return cached
+
+    import zipfile
+
+    try:
+        zf = zipfile.ZipFile(path)
+    except (OSError, zipfile.BadZipFile):
+        _archives.pop(path, None)
+        return None
+    match_name = _regex(DAY_FILE_PATTERN).match
+    members = {}
+    for info in zf.infolist():
+        match = match_name(info.filename)
+        if match:
+            members[match.group(1)] = info
+    if cached:
+        cached[1].close()
+    cached = _archives[path] = (stamp, zf, members)
+    return cached
+
+
+def scan_archived_days(base_dir):
+    """扫描月度归档，返回 {date_str: (归档 mtime_ns, 当天原文大小)}"""
+    stamps = {}
+    match_name = _regex(ARCHIVE_FILE_PATTERN).match
+    try:
+        with os.scandir(os.path.join(base_dir, ARCHIVE_DIR_NAME)) as it:
+            paths = [entry.path for entry in it if match_name(entry.name)]
+    except OSError:
+        return stamps
+    for path in paths:
+        cached = _open_archive(path)
+        if cached:
+            for date_str, info in cached[2].items():
+                stamps[date_str] = (cached[0][0], info.file_size)
+    return stamps
+
+
+def read_archived_day(base_dir, date_str):
+    """
+    从月度归档读取一天的日志原文，未归档时返回 None
+    归档按字节原样保存；这里与文本模式 open() 一样把 CRLF / CR 换行统一为 \\n
+    """
+    cached = _open_archive(archive_path(base_dir, date_str))
+    if not cached or date_str not in cached[2]:
+        return None
+    import zlib
+    import zipfile
+
+    try:
+        text = cached[1].read(cached[2][date_str]).decode("utf-8")
+    except (zipfile.BadZipFile, zlib.error) as e:
+        raise OSError(f"corrupt archive {cached[1].filename}: {e}") from e
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def read_day_lines(filepath):
+    """逐行读取一天的日志：先读归档部分（若已归档），再读目录中的 .md 文件"""
+    base_dir, name = os.path.split(filepath)
+    match = _regex(DAY_FILE_PATTERN).match(name)
+    if match:
+        text = read_archived_day(base_dir, match.group(1))
+        if text:
+            yield from text.splitlines(keepends=True)
+    try:
+        f = open(filepath, "r", encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with f:
+        yield from f
+
+
+def read_day_lines_reverse(filepath, chunk_size=1 << 16):
+    """倒序逐行读取一天的日志：.md 文件从末尾按块向前读，然后是归档部分"""
+    try:
+        f = open(filepath, "rb")
+    except FileNotFoundError:
+        f = None
+    if f:
+        with f:
+            pos = f.seek(0, os.SEEK_END)
+            buf = b""  # 尚未输出的部分，开头一行可能还缺前半截
+            while pos > 0:
+                step = min(chunk_size, pos)
+                pos -= step
+                f.seek(pos)
+                buf = f.read(step) + buf
+                # 从后往前切出开头位置已确定（前面有换行）的完整行
+                end = len(buf)
+                idx = buf.rfind(b"\n", 0, end - 1)
+                while idx >= 0:
+                    yield buf[idx + 1:end].decode("utf-8")
+                    end = idx + 1
+                    idx = buf.rfind(b"\n", 0, end - 1)
+                buf = buf[:end]
+            if buf:
+                yield buf.decode("utf-8")
+
+    base_dir, name = os.path.split(filepath)
+    match = _regex(DAY_FILE_PATTERN).match(name)
+    text = read_archived_day(base_dir, match.group(1)) if match else None
+    if text:
+        yield from reversed(text.splitlines(keepends=True))
+
+
+# ================= Workspaces =================
+class WorkspaceScanner:
+    """
+    在工作区根目录下查找项目级 .devlog 目录（--all 模式）
+    按层并行遍历；每个目录缓存 (mtime_ns, 子目录名, 是否含 .devlog)，
+    目录 mtime 不变说明没有增删子项，直接沿用缓存只 stat 不 listdir，未改动的树不会重新遍历
+    """
+
+    CACHE_NAME = "workspaces.json"
+    MAX_DEPTH = 6
+    SKIP_DIRS = {"node_modules", "__pycache__", "venv", "build", "dist", "target"}
+
+    def __init__(self, cache_dir, jobs=None):
+        self.cache_dir = cache_dir
+        self.cache_file = os.path.join(cache_dir, self.CACHE_NAME)
+        self.jobs = jobs
+
+    @profiled("discover")
+    def discover(self, roots):
+        """返回 roots 下所有 .devlog 目录（排序）"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        cache = self._load()
+        nodes = {}  # 本次遍历到的目录，写回缓存（顺带清理已删除的目录）
+        found = []
+        level = [os.path.abspath(os.path.expanduser(root)) for root in roots]
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            for depth in range(self.MAX_DEPTH + 1):
+                level = [path for path in dict.fromkeys(level) if path not in nodes]
+                if not level:
+                    break
+                # mtime 未变的目录在当前线程直接用缓存，只把需要 listdir 的目录交给线程池
+                stale = {}
+                for path in level:
+                    try:
+                        mtime_ns = os.stat(path).st_mtime_ns
+                    except OSError:
+                        continue
+                    cached = cache.get(path)
+                    if cached and cached[0] == mtime_ns:
+                        nodes[path] = cached
+                    else:
+                        stale[path] = mtime_ns
+                for path, node in zip(stale, pool.map(self._list, stale.keys(), stale.values())):
+                    if node is not None:
+                        nodes[path] = node
+
+                next_level = []
+                for path in level:
+                    node = nodes.get(path)
+                    if node is None:
+                        continue
+                    if node[2]:
+                        found.append(os.path.join(path, LOCAL_DIR_NAME))
+                    if depth < self.MAX_DEPTH:
+                        next_level.extend(os.path.join(path, name) for name in node[1])
+                level = next_level
+
+        if nodes != cache:
+            self._save(nodes)
+        return sorted(found)
+
+    def _list(self, path, mtime_ns):
+        """列出目录，返回 [mtime_ns, 子目录名, 是否含 .devlog]"""
+        children = []
+        has_devlog = False
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if entry.name == LOCAL_DIR_NAME:
+                        has_devlog = True
+                    elif not entry.name.startswith(".") and entry.name not in self.SKIP_DIRS:
+                        children.append(entry.name)
+        except OSError:
+            return None
+        return [mtime_ns, sorted(children), has_devlog]
+
+    def _load(self):
+        import json
+
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, nodes):
+        import json
+
+        tmp_file = f"{self.cache_file}.{os.getpid()}.tmp"
+        try:
+            ensure_dir(self.cache_dir)
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(nodes, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_file, self.cache_file)
+        except OSError:
+            pass
+
 
 class Config:
     """配置管理器"""
 
     def __init__(self, auto_init=True):
         self.config_file = CONFIG_FILE
-        self._config = self._load_or_init(auto_init)
+        self.auto_init = auto_init
+        self._loaded = None
 
+    @property
+    def _config(self):
+        """首次访问时才加载（环境变量已给出全局目录时写入无需读配置）"""
+        if self._loaded is None:
+            self._loaded = self._load_or_init(self.auto_init)
+        return self._loaded
+
+    def load(self):
+        """立即加载配置（守护进程启动时预热）"""
+        return self._config
+
+    @profiled("config")
     def _load_or_init(self, auto_init):
         """加载配置或初始化"""
+        import json
+
         if os.path.exists(self.config_file):
             try:
                 with open(self.config_file, "r", encoding="utf-8") as f:
@@ -51,6 +544,8 @@ class Config:
 
     def _init_config(self):
         """首次运行时初始化配置"""
+        import json
+
         print()
         print("=" * 50)
         print("👋 Welcome to dlog!")
@@ -93,12 +588,12 @@ class Config:
 
         # 确保目录存在
         try:
-            Path(selected_dir).mkdir(parents=True, exist_ok=True)
+            ensure_dir(selected_dir)
         except OSError as e:
             print(f"❌ Failed to create directory: {e}")
             print("Using fallback: ~/dlog")
             selected_dir = os.path.expanduser("~/dlog")
-            Path(selected_dir).mkdir(parents=True, exist_ok=True)
+            ensure_dir(selected_dir)
 
         # 构造配置
         config = {
@@ -108,7 +603,7 @@ class Config:
 
         # 保存配置
         try:
-            Path(self.config_file).parent.mkdir(parents=True, exist_ok=True)
+            ensure_dir(os.path.dirname(self.config_file))
             with open(self.config_file, "w", encoding="utf-8") as f:
                 json.dump(config, f, indent=2, ensure_ascii=False)
             print()
@@ -123,7 +618,69 @@ class Config:
     @property
     def global_dir(self):
         """获取全局日志目录（支持环境变量覆盖）"""
-        return os.environ.get("DEVLOG_GLOBAL_DIR", self._config.get("global_dir", os.path.expanduser("~/devlog")))
+        if "DEVLOG_GLOBAL_DIR" in os.environ:
+            return os.environ["DEVLOG_GLOBAL_DIR"]
+        return self._config.get("global_dir", os.path.expanduser("~/devlog"))
+
+    @property
+    def use_index(self):
+        """是否启用 SQLite 条目索引（支持环境变量 DEVLOG_INDEX 覆盖）"""
+        env = os.environ.get("DEVLOG_INDEX")
+        if env is not None:
+            return env.lower() not in ("", "0", "false", "no", "off")
+        return bool(self._config.get("index", False))
+
+    @property
+    def durability(self):
+        """
+        写入持久化策略（环境变量 DEVLOG_DURABILITY 覆盖）
+        none: 只写入页缓存 | fsync-per-entry: 每次写入后 fsync | group-commit: 批量写入后 fsync
+        """
+        value = os.environ.get("DEVLOG_DURABILITY") or self._config.get("durability", "none")
+        return value if value in DURABILITY_MODES else "none"
+
+    @property
+    def group_commit(self):
+        """group-commit 的窗口: (最长等待秒数, 最多条目数)"""
+        return (
+            float(self._config.get("group_commit_ms", 200)) / 1000,
+            max(int(self._config.get("group_commit_entries", 100)), 1),
+        )
+
+    @property
+    def env_only(self):
+        """环境变量同时给出全局目录和持久化策略时，写入路径完全不读配置文件"""
+        return "DEVLOG_GLOBAL_DIR" in os.environ and bool(os.environ.get("DEVLOG_DURABILITY"))
+
+    @property
+    def near_dup(self):
+        """
+        近似重复检测（默认关闭，环境变量 DEVLOG_NEAR_DUP 覆盖）：启用时返回 (相似度阈值, 回看天数)，否则 None
+        env_only 时只看 DEVLOG_NEAR_DUP，阈值和天数取默认值
+        """
+        env = os.environ.get("DEVLOG_NEAR_DUP")
+        if env is not None:
+            if env.lower() in ("", "0", "false", "no", "off"):
+                return None
+        elif self.env_only or not self._config.get("near_dup", False):
+            return None
+        config = {} if self.env_only else self._config
+        return (
+            float(config.get("near_dup_threshold", 0.8)),
+            int(config.get("near_dup_days", 14)),
+        )
+
+    @property
+    def workspace_roots(self):
+        """--all 模式下查找项目 .devlog 的根目录（环境变量 DEVLOG_WORKSPACE_ROOTS 覆盖，os.pathsep 分隔）"""
+        env = os.environ.get("DEVLOG_WORKSPACE_ROOTS")
+        roots = env.split(os.pathsep) if env is not None else self._config.get("workspace_roots", [])
+        return [os.path.expanduser(root) for root in roots if root]
+
+    @property
+    def summary_cache_mb(self):
+        """每日解析缓存的磁盘上限（MB），0 表示关闭"""
+        return float(self._config.get("summary_cache_mb", SummaryCache.DEFAULT_MAX_MB))
 
     @staticmethod
     def reset():
@@ -145,6 +702,695 @@ class Colors:
     GRAY = "\033[90m"
 
 
+def date_ordinal(date_str):
+    """YYYY-MM-DD → 日期序数（date.toordinal()）"""
+    return datetime.date(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:10])).toordinal()
+
+
+class Entry:
+    """
+    紧凑条目记录：__slots__ 不带 __dict__，日期存为序数，
+    分类 / 项目 / 时间为驻留字符串（同值共享一个对象）
+    """
+
+    __slots__ = ("date", "time", "category", "project", "title", "detail")
+
+    def __init__(self, date, time, category, project, title, detail=""):
+        self.date = date
+        self.time = sys.intern(time)
+        self.category = sys.intern(category)
+        self.project = sys.intern(project)
+        self.title = title
+        self.detail = detail
+
+    def __repr__(self):
+        return f"Entry({self.date_str} {self.time} {self.category} {self.project} {self.title!r})"
+
+    @property
+    def date_str(self):
+        return datetime.date.fromordinal(self.date).strftime("%Y-%m-%d")
+
+    def as_dict(self):
+        """转为 dict（Python API 对外仍返回 dict）"""
+        return {
+            "date": self.date_str,
+            "time": self.time,
+            "category": self.category,
+            "project": self.project,
+            "title": self.title,
+            "detail": self.detail,
+        }
+
+
+class EntryTable:
+    """
+    报告用的列式条目表，每个字段一列：
+      dates       array("l")  日期序数
+      categories  array("B")  分类编号（category_names 下标）
+      projects    array("l")  项目编号（project_names 下标）
+      times / titles / details  list（时间为驻留字符串）
+    分类计数、日期去重、按分类分组都在整数列上完成，不为每条建 dict 和 (date, item) 元组；
+    需要单条时由 entry(i) 或迭代临时构造 Entry
+    """
+
+    def __init__(self):
+        from array import array
+
+        self.category_names = tuple(Logger.CATEGORIES)
+        self._category_codes = {cat: code for code, cat in enumerate(self.category_names)}
+        self.project_names = []
+        self._project_codes = {}
+        self.dates = array("l")
+        self.categories = array("B")
+        self.projects = array("l")
+        self.times = []
+        self.titles = []
+        self.details = []
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __iter__(self):
+        for i in range(len(self.titles)):
+            yield self.entry(i)
+
+    def entry(self, i):
+        return Entry(
+            self.dates[i], self.times[i], self.category_names[self.categories[i]],
+            self.project_names[self.projects[i]], self.titles[i], self.details[i],
+        )
+
+    def append(self, ordinal, category, time_str, project, title, detail):
+        """追加一条，未知分类忽略"""
+        code = self._category_codes.get(category)
+        if code is None:
+            return
+        project_code = self._project_codes.get(project)
+        if project_code is None:
+            project_code = self._project_codes[project] = len(self.project_names)
+            self.project_names.append(sys.intern(project))
+        self.dates.append(ordinal)
+        self.categories.append(code)
+        self.projects.append(project_code)
+        self.times.append(sys.intern(time_str))
+        self.titles.append(title)
+        self.details.append(detail)
+
+    def add_day(self, date_str, items):
+        """追加一天的解析结果（iter_log_entries 产出的 dict）"""
+        ordinal = date_ordinal(date_str)
+        append = self.append
+        for item in items:
+            append(ordinal, item["category"], item["time"], item["project"], item["title"], item["detail"])
+
+    def add_rows(self, rows):
+        """追加 (date, time, project, category, title, detail) 行（索引查询结果）"""
+        last_date = ordinal = None
+        append = self.append
+        for date_str, time_str, project, category, title, detail in rows:
+            if date_str != last_date:
+                last_date, ordinal = date_str, date_ordinal(date_str)
+            append(ordinal, category, time_str, project, title, detail)
+
+    def category_counts(self):
+        """{分类: 条数}，只含有条目的分类"""
+        counts = {}
+        for code, cat in enumerate(self.category_names):
+            n = self.categories.count(code)
+            if n:
+                counts[cat] = n
+        return counts
+
+    def rows_by_category(self):
+        """{分类: array 行号}，行号保持表内顺序"""
+        from array import array
+
+        groups = {cat: array("l") for cat in self.category_names}
+        rows = list(groups.values())
+        for i, code in enumerate(self.categories):
+            rows[code].append(i)
+        return groups
+
+    @classmethod
+    def merge(cls, tables):
+        """合并多个目录的表：去掉重复条目，按日期倒序、同一天按时间排列（规则同 Logger.merge_entries）"""
+        seen = set()
+        entries = []
+        for table in tables:
+            for entry in table:
+                key = (entry.date, entry.time, entry.category, entry.title)
+                if key not in seen:
+                    seen.add(key)
+                    entries.append(entry)
+        entries.sort(key=lambda entry: entry.time)
+        entries.sort(key=lambda entry: entry.date, reverse=True)
+
+        merged = cls()
+        for entry in entries:
+            merged.append(entry.date, entry.category, entry.time, entry.project, entry.title, entry.detail)
+        return merged
+
+
+class SummaryCache:
+    """
+    每天解析结果的缓存：.devlog-cache/days/YYYY-MM-DD.json
+    以日志文件的 (mtime_ns, size) 校验，未变化的日子直接读缓存免解析；
+    命中时刷新缓存文件的 mtime，超出大小上限时按最近使用时间（LRU）淘汰
+    进程内另保留最近用过的若干天，守护进程里多次出报告时连缓存文件都不用读
+    """
+
+    DIR_NAME = "days"
+    DEFAULT_MAX_MB = 16
+    MEMO_DAYS = 64
+    FIELDS = ("category", "time", "project", "title", "detail")
+
+    def __init__(self, base_dir, logger, max_mb=DEFAULT_MAX_MB):
+        import threading
+
+        self.base_dir = base_dir
+        self.logger = logger
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.cache_dir = os.path.join(base_dir, CACHE_DIR_NAME, self.DIR_NAME)
+        self._memo = {}  # {date_str: (stamp, items)}，按使用顺序排列
+        self._memo_lock = threading.Lock()  # load_days 的线程池并发调用 load
+        self._stored = False
+
+    def load(self, date_str):
+        """返回当天条目列表；日志不存在时返回 None"""
+        stamp = day_stamp(self.base_dir, date_str)
+        if stamp is None:
+            return None
+        stamp = list(stamp)
+
+        with self._memo_lock:
+            memo = self._memo.pop(date_str, None)
+            if memo and memo[0] == stamp:
+                self._memo[date_str] = memo
+                return memo[1]
+
+        items = self._read(date_str, stamp)
+        if items is None:
+            items = list(self.logger.iter_log_entries(os.path.join(self.base_dir, f"{date_str}.md")))
+            self._write(date_str, stamp, items)
+
+        with self._memo_lock:
+            self._memo[date_str] = (stamp, items)
+            while len(self._memo) > self.MEMO_DAYS:
+                self._memo.pop(next(iter(self._memo)))
+        return items
+
+    def _read(self, date_str, stamp):
+        import json
+
+        cache_file = os.path.join(self.cache_dir, f"{date_str}.json")
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("stamp") != stamp:
+                return None
+            os.utime(cache_file)  # LRU: 记录最近使用
+        except (OSError, ValueError):
+            return None
+        return [dict(zip(self.FIELDS, row)) for row in data.get("entries", [])]
+
+    def _write(self, date_str, stamp, items):
+        import json
+
+        data = {
+            "stamp": stamp,
+            "entries": [[item[field] for field in self.FIELDS] for item in items],
+        }
+        cache_file = os.path.join(self.cache_dir, f"{date_str}.json")
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        try:
+            ensure_dir(self.cache_dir)
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_file, cache_file)
+            self._stored = True
+        except OSError as e:
+            if self.logger.verbose:
+                self.logger._print(f"Warning: Failed to save summary cache - {e}", self.logger.c.YELLOW)
+
+    def evict(self):
+        """总大小超过上限时删除最久未使用的缓存文件"""
+        if not self._stored:
+            return
+        self._stored = False
+        files = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".json"):
+                        st = entry.stat()
+                        files.append((st.st_mtime_ns, st.st_size, entry.path))
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+
+class EntryIndex:
+    """
+    SQLite 条目索引
+    按日志文件的 mtime/size 增量刷新，只重新解析变化过的文件，
+    查询直接走索引 SELECT
+    """
+
+    SCHEMA_VERSION = 3
+    DB_NAME = "entries.db"
+
+    def __init__(self, base_dir, logger):
+        import sqlite3
+
+        self.base_dir = base_dir
+        self.logger = logger
+        cache_dir = os.path.join(base_dir, CACHE_DIR_NAME)
+        ensure_dir(cache_dir)
+        self.db_path = os.path.join(cache_dir, self.DB_NAME)
+        self.conn = sqlite3.connect(self.db_path)
+        # 索引可随时重建，不必为它每次提交都 fsync
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self._ensure_schema()
+
+    def close(self):
+        self.conn.close()
+
+    def _ensure_schema(self):
+        """创建表结构；版本不一致时丢弃重建（索引只是派生数据）"""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            self.conn.executescript("""
+                DROP TABLE IF EXISTS files;
+                DROP TABLE IF EXISTS entries;
+                DROP TABLE IF EXISTS tokens;
+                DROP TABLE IF EXISTS day_counts;
+            """)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                date TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                date TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                time TEXT,
+                project TEXT,
+                category TEXT NOT NULL,
+                title TEXT NOT NULL,
+                detail TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_date ON entries (date, seq);
+            CREATE TABLE IF NOT EXISTS tokens (
+                token TEXT NOT NULL,
+                entry_id INTEGER NOT NULL,
+                PRIMARY KEY (token, entry_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_tokens_entry ON tokens (entry_id);
+            CREATE TABLE IF NOT EXISTS day_counts (
+                date TEXT NOT NULL,
+                dimension TEXT NOT NULL,
+                key TEXT NOT NULL,
+                n INTEGER NOT NULL,
+                PRIMARY KEY (date, dimension, key)
+            ) WITHOUT ROWID;
+        """)
+        self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self.conn.commit()
+
+    def _stamps_for(self, dates):
+        """获取指定日期文件的 (mtime_ns, size)，不存在的跳过"""
+        stamps = {}
+        for date_str in dates:
+            stamp = day_stamp(self.base_dir, date_str)
+            if stamp is not None:
+                stamps[date_str] = stamp
+        return stamps
+
+    @profiled("index_refresh")
+    def refresh(self, dates=None):
+        """
+        增量刷新索引，返回重新解析的文件数
+        dates 为 None 时扫描整个目录，否则只检查给定日期
+        """
+        stamps = scan_day_files(self.base_dir) if dates is None else self._stamps_for(dates)
+        known = {
+            row[0]: (row[1], row[2])
+            for row in self.conn.execute("SELECT date, mtime_ns, size FROM files")
+        }
+        scope = known.keys() if dates is None else [d for d in dates if d in known]
+
+        reparsed = 0
+        with self.conn:
+            # 文件已删除：清理索引
+            for date_str in list(scope):
+                if date_str not in stamps:
+                    self._drop(date_str)
+            for date_str, stamp in stamps.items():
+                if known.get(date_str) == stamp:
+                    continue
+                self._reindex(date_str, stamp)
+                reparsed += 1
+        return reparsed
+
+    def _drop(self, date_str):
+        self.conn.execute(
+            "DELETE FROM tokens WHERE entry_id IN (SELECT id FROM entries WHERE date = ?)",
+            (date_str,),
+        )
+        self.conn.execute("DELETE FROM entries WHERE date = ?", (date_str,))
+        self.conn.execute("DELETE FROM day_counts WHERE date = ?", (date_str,))
+        self.conn.execute("DELETE FROM files WHERE date = ?", (date_str,))
+
+    def _reindex(self, date_str, stamp):
+        self._drop(date_str)
+        filepath = os.path.join(self.base_dir, f"{date_str}.md")
+        counts = {}  # 当天的分类 / 项目 / 小时计数，供 stats 直接汇总
+        postings = []
+        for seq, item in enumerate(self.logger.iter_log_entries(filepath)):
+            keys = [("category", item["category"]), ("project", item["project"])]
+            if item["time"][:2].isdigit():
+                keys.append(("hour", item["time"][:2]))
+            for key in keys:
+                counts[key] = counts.get(key, 0) + 1
+
+            cursor = self.conn.execute(
+                "INSERT INTO entries (date, seq, time, project, category, title, detail) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (date_str, seq, item["time"], item["project"], item["category"], item["title"], item["detail"]),
+            )
+            entry_id = cursor.lastrowid
+            postings.extend((token, entry_id) for token in tokenize(f"{item['title']}\n{item['detail']}"))
+
+        # 按 token 排序后批量插入，B 树顺序写入比逐条随机插入快得多
+        postings.sort()
+        self.conn.executemany("INSERT INTO tokens (token, entry_id) VALUES (?, ?)", postings)
+        self.conn.executemany(
+            "INSERT INTO day_counts (date, dimension, key, n) VALUES (?, ?, ?, ?)",
+            [(date_str, dimension, key, n) for (dimension, key), n in counts.items()],
+        )
+        self.conn.execute(
+            "INSERT INTO files (date, mtime_ns, size) VALUES (?, ?, ?)",
+            (date_str, stamp[0], stamp[1]),
+        )
+
+    def dates_between(self, start, end):
+        """返回 [start, end] 内有日志的日期（倒序）"""
+        rows = self.conn.execute(
+            "SELECT date FROM files WHERE date BETWEEN ? AND ? ORDER BY date DESC",
+            (start, end),
+        )
+        return [row[0] for row in rows]
+
+    def entries_between(self, start, end):
+        """返回 [start, end] 内的条目（EntryTable，按日期倒序、同一天按写入顺序）"""
+        table = EntryTable()
+        table.add_rows(self.conn.execute(
+            "SELECT date, time, project, category, title, detail FROM entries "
+            "WHERE date BETWEEN ? AND ? ORDER BY date DESC, seq",
+            (start, end),
+        ))
+        return table
+
+    def stats(self, since=None, until=None, top=10):
+        """
+        汇总每日计数
+        返回 dict: days / entries / category / project / hour / busiest_days / incident_months
+        """
+        since = since or "0000-00-00"
+        until = until or "9999-99-99"
+
+        def query(sql, *params):
+            return self.conn.execute(sql, (since, until) + params).fetchall()
+
+        per_day = query(
+            "SELECT date, SUM(n) FROM day_counts WHERE date BETWEEN ? AND ? "
+            "AND dimension = 'category' GROUP BY date"
+        )
+        grouped = (
+            "SELECT key, SUM(n) AS total FROM day_counts WHERE date BETWEEN ? AND ? "
+            "AND dimension = ? GROUP BY key ORDER BY total DESC, key"
+        )
+        return {
+            "days": len(per_day),
+            "entries": sum(n for _, n in per_day),
+            "first": min((d for d, _ in per_day), default=None),
+            "last": max((d for d, _ in per_day), default=None),
+            "category": query(grouped, "category"),
+            "project": query(grouped + " LIMIT ?", "project", top),
+            "hour": sorted(query(grouped, "hour")),
+            "busiest_days": sorted(per_day, key=lambda row: (-row[1], row[0]))[:top],
+            "incident_months": query(
+                "SELECT substr(date, 1, 7) AS month, SUM(n) FROM day_counts WHERE date BETWEEN ? AND ? "
+                "AND dimension = 'category' AND key = 'incident' GROUP BY month ORDER BY month"
+            ),
+        }
+
+    def search(self, terms, category=None, project=None, since=None, limit=50):
+        """
+        倒排索引检索：返回同时包含所有 token 的条目（按日期倒序）
+        结果: [(date_str, item), ...]，item 含 category 字段
+        """
+        tokens = tokenize(" ".join(terms), query=True)
+        if not tokens:
+            return []
+
+        placeholders = ", ".join("?" * len(tokens))
+        sql = (
+            "SELECT date, time, project, category, title, detail FROM entries WHERE id IN ("
+            f"SELECT entry_id FROM tokens WHERE token IN ({placeholders}) "
+            "GROUP BY entry_id HAVING COUNT(*) = ?)"
+        )
+        params = list(tokens) + [len(tokens)]
+        if category:
+            sql += " AND category = ?"
+            params.append(category)
+        if project:
+            sql += " AND project = ?"
+            params.append(project)
+        if since:
+            sql += " AND date >= ?"
+            params.append(since)
+        sql += " ORDER BY date DESC, seq LIMIT ?"
+        params.append(limit)
+
+        return [
+            (date_str, {
+                "category": cat,
+                "title": title,
+                "time": time_str,
+                "project": proj,
+                "detail": detail,
+            })
+            for date_str, time_str, proj, cat, title, detail in self.conn.execute(sql, params)
+        ]
+
+
+class NearDupIndex:
+    """
+    近似重复检测：最近 lookback 天条目（标题 + 细节）的字符 3-gram MinHash 签名
+    签名按 LSH 分段（16 段 × 4 行）写入 .devlog-cache/neardup.db 的分桶表，
+    一次写入只比较与它至少落在同一个桶里的候选，不必逐条比较整个窗口
+    按每天日志文件的 mtime/size 增量同步，只为新出现的条目计算签名；
+    未归档的日子记住已解析到的字节偏移（同 tail -f 的 DayFollower），每次写入只解析新追加的部分
+    """
+
+    SCHEMA_VERSION = 3
+    DB_NAME = "neardup.db"
+    SHINGLE = 3
+    BANDS = 16
+    ROWS = 4
+    _params = None
+
+    def __init__(self, base_dir, logger, threshold=0.8, lookback_days=14):
+        import sqlite3
+
+        self.base_dir = base_dir
+        self.logger = logger
+        self.threshold = threshold
+        self.lookback_days = lookback_days
+        cache_dir = os.path.join(base_dir, CACHE_DIR_NAME)
+        ensure_dir(cache_dir)
+        self.conn = sqlite3.connect(os.path.join(cache_dir, self.DB_NAME))
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        """创建表结构；版本不一致（如桶号算法变化）时丢弃重建。每次写入都会打开，版本一致时直接返回"""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == self.SCHEMA_VERSION:
+            return
+        self.conn.executescript("""
+                DROP TABLE IF EXISTS days;
+                DROP TABLE IF EXISTS sigs;
+                DROP TABLE IF EXISTS buckets;
+            """)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS days (
+                date TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                inode INTEGER,
+                offset INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS sigs (
+                key TEXT PRIMARY KEY,
+                date TEXT NOT NULL,
+                time TEXT,
+                category TEXT NOT NULL,
+                title TEXT NOT NULL,
+                sig BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_sigs_date ON sigs (date);
+            CREATE TABLE IF NOT EXISTS buckets (
+                bucket INTEGER NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (bucket, key)
+            ) WITHOUT ROWID;
+        """)
+        self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    @classmethod
+    def signature(cls, text):
+        """MinHash 签名：BANDS × ROWS 个 32 位最小哈希（multiply-shift: (a·x + b mod 2^64) 的高 32 位）"""
+        import zlib
+
+        if cls._params is None:
+            params = []
+            for i in range(cls.BANDS * cls.ROWS):
+                digest = hashlib.blake2b(f"devlog-minhash-{i}".encode(), digest_size=16).digest()
+                params.append((int.from_bytes(digest[:8], "little") | 1, int.from_bytes(digest[8:], "little")))
+            cls._params = params
+
+        text = " ".join(text.split()).casefold()
+        k = cls.SHINGLE
+        xs = [zlib.crc32(text[i:i + k].encode("utf-8")) for i in range(max(len(text) - k + 1, 1))]
+        xs = list(set(xs))
+        mask = (1 << 64) - 1
+        # 按完整 64 位取最小值再右移，等价于对高 32 位取最小值
+        return [min([(a * x + b) & mask for x in xs]) >> 32 for a, b in cls._params]
+
+    @classmethod
+    def bands(cls, sig):
+        """
+        每段 ROWS 个值（连同段号）的 blake2b 摘要作为 64 位桶号
+        不用内置 hash()：它随 Python 版本和 32/64 位构建变化，升级解释器后已存的桶就对不上了
+        """
+        rows = cls.ROWS
+        buckets = []
+        for band in range(cls.BANDS):
+            data = b"".join(v.to_bytes(4, "little") for v in [band, *sig[band * rows:(band + 1) * rows]])
+            buckets.append(int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little", signed=True))
+        return buckets
+
+    @staticmethod
+    def entry_key(date_str, item):
+        key = f"{date_str}\0{item['category']}\0{item['title']}\0{item['detail']}".encode("utf-8")
+        return hashlib.blake2b(key, digest_size=12).hexdigest()
+
+    def _since(self):
+        return (datetime.date.today() - datetime.timedelta(days=max(self.lookback_days - 1, 0))).strftime("%Y-%m-%d")
+
+    @profiled("near_dup_sync")
+    def sync(self):
+        """让签名与窗口内的日志一致：丢弃窗口外的条目，为变化过的日子补算新条目"""
+        from array import array
+
+        since = self._since()
+        known = {
+            row[0]: ((row[1], row[2]), row[3], row[4])
+            for row in self.conn.execute("SELECT date, mtime_ns, size, inode, offset FROM days")
+        }
+        dates = [
+            (datetime.date.today() - datetime.timedelta(days=i)).strftime("%Y-%m-%d")
+            for i in range(max(self.lookback_days, 1))
+        ]
+        with self.conn:
+            if any(date_str < since for date_str in known):
+                self.conn.execute(
+                    "DELETE FROM buckets WHERE key IN (SELECT key FROM sigs WHERE date < ?)", (since,),
+                )
+                self.conn.execute("DELETE FROM sigs WHERE date < ?", (since,))
+                self.conn.execute("DELETE FROM days WHERE date < ?", (since,))
+
+            for date_str in dates:
+                stamp = day_stamp(self.base_dir, date_str)
+                row = known.get(date_str)
+                if stamp is None or (row and row[0] == stamp):
+                    continue
+                cached = _open_archive(archive_path(self.base_dir, date_str))
+                if cached and date_str in cached[2]:
+                    # 已归档的日子（回看窗口内很少见）整天重读
+                    items = self.logger.load_day(self.base_dir, date_str) or []
+                    inode, offset = None, 0
+                else:
+                    # 从上次的偏移继续；文件被替换或截断时 DayFollower 会从头读
+                    follower = DayFollower(self.base_dir, date_str)
+                    if row:
+                        follower.inode, follower.offset = row[1], row[2]
+                    items = follower.poll()
+                    inode, offset = follower.inode, follower.offset
+
+                for item in items:
+                    key = self.entry_key(date_str, item)
+                    sig = self.signature(f"{item['title']} {item['detail']}")
+                    inserted = self.conn.execute(
+                        "INSERT OR IGNORE INTO sigs (key, date, time, category, title, sig) VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, date_str, item["time"], item["category"], item["title"], array("I", sig).tobytes()),
+                    ).rowcount
+                    if inserted:
+                        self.conn.executemany(
+                            "INSERT OR IGNORE INTO buckets (bucket, key) VALUES (?, ?)",
+                            [(bucket, key) for bucket in self.bands(sig)],
+                        )
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO days (date, mtime_ns, size, inode, offset) VALUES (?, ?, ?, ?, ?)",
+                    (date_str, stamp[0], stamp[1], inode, offset),
+                )
+
+    @profiled("near_dup_check")
+    def find(self, category, title, detail, date_str):
+        """
+        返回窗口内与新条目最相似且达到阈值的 (相似度, date, time, category, title)，没有时返回 None
+        同一天同分类同标题的精确重复留给 is_duplicate 处理
+        """
+        from array import array
+
+        self.sync()
+        sig = self.signature(f"{title} {detail}")
+        buckets = self.bands(sig)
+        rows = self.conn.execute(
+            "SELECT date, time, category, title, sig FROM sigs WHERE date >= ? AND key IN ("
+            f"SELECT key FROM buckets WHERE bucket IN ({', '.join('?' * len(buckets))}))",
+            [self._since()] + buckets,
+        )
+        exact = Logger.dedup_hash(category, title)
+        best = None
+        for cand_date, cand_time, cand_category, cand_title, blob in rows:
+            if cand_date == date_str and Logger.dedup_hash(cand_category, cand_title) == exact:
+                continue
+            other = array("I")
+            other.frombytes(blob)
+            similarity = sum(1 for x, y in zip(sig, other) if x == y) / len(sig)
+            if similarity >= self.threshold and (best is None or similarity > best[0]):
+                best = (similarity, cand_date, cand_time, cand_category, cand_title)
+        return best
+
+
 class Logger:
     """日志记录器核心类"""
 
@@ -159,10 +1405,23 @@ class Logger:
         "misc": {"emoji": "📝", "desc": "其他"},
     }
 
+    # 条目标题行: ### [14:30] `@project` CATEGORY: title（时间、项目可缺省）
+    # 手工编辑的标题（如 "### 14:31 BUG: x"）分类前可能还有其他文字，与旧解析器一样照常识别
+    HEADER_PATTERN = (
+        r"^### +(?:\[(?P<time>\d{2}:\d{2})\] *)?(?:`(?P<project>@[^`]+)` *)?.*?"
+        r"(?P<category>" + "|".join(map(str.upper, CATEGORIES)) + r"): (?P<title>.*)"
+    )
+
     def __init__(self, verbose=False, config=None):
         self.verbose = verbose
         self.c = Colors
         self.config = config or Config()
+        # 进程内防重缓存: {filepath: ((mtime_ns, size), hashes)}
+        self._dedup_cache = {}
+        # 每日解析缓存: {base_dir: SummaryCache}
+        self._summary_caches = {}
+        # group-commit 写缓冲（仅长驻进程启用）
+        self._write_queue = None
 
     def _print(self, msg, color=None):
         """带颜色的打印"""
@@ -178,42 +1437,102 @@ class Logger:
             return "Global"
         return os.path.basename(cwd)
 
+    @staticmethod
+    def dedup_hash(category, content):
+        """(分类, 标题) 归一化后的短哈希：忽略大小写与多余空白"""
+        title = " ".join(content.split()).casefold()
+        key = f"{category.lower()}\0{title}".encode("utf-8")
+        return hashlib.blake2b(key, digest_size=8).hexdigest()
+
+    @staticmethod
+    def _dedup_sidecar(filepath):
+        """当天日志对应的哈希 sidecar 路径"""
+        base_dir, name = os.path.split(filepath)
+        return os.path.join(base_dir, CACHE_DIR_NAME, "dedup", name[:-3] + ".hashes")
+
+    @profiled("dedup_check")
+    def _load_dedup_hashes(self, filepath):
+        """
+        读取 sidecar 哈希集合
+        每行格式: <hash> <日志 mtime_ns> <日志 size>，最后一行的 mtime/size
+        与日志文件不一致（或 sidecar 缺失）时视为过期，从日志重建
+        """
+        st = os.stat(filepath)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._dedup_cache.get(filepath)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        try:
+            with open(self._dedup_sidecar(filepath), "r", encoding="utf-8") as f:
+                fields = f.read().split()
+        except FileNotFoundError:
+            fields = []
+
+        if len(fields) % 3 == 0 and fields[-2:] == [str(stamp[0]), str(stamp[1])]:
+            hashes = set(fields[0::3])
+            hashes.discard("-")
+            self._dedup_cache[filepath] = (stamp, hashes)
+            return hashes
+        return self._rebuild_dedup_hashes(filepath)
+
+    def _rebuild_dedup_hashes(self, filepath):
+        """从日志文件重建 sidecar"""
+        hashes = {
+            self.dedup_hash(item["category"], item["title"])
+            for item in self.iter_log_entries(filepath)
+        }
+
+        st = os.stat(filepath)
+        self._dedup_cache[filepath] = ((st.st_mtime_ns, st.st_size), hashes)
+        sidecar = self._dedup_sidecar(filepath)
+        try:
+            ensure_dir(os.path.dirname(sidecar))
+            with open(sidecar, "w", encoding="utf-8") as f:
+                for h in sorted(hashes):
+                    f.write(f"{h} {st.st_mtime_ns} {st.st_size}\n")
+                if not hashes:
+                    # 空日志也要记录时间戳，避免反复重建
+                    f.write(f"- {st.st_mtime_ns} {st.st_size}\n")
+        except OSError as e:
+            if self.verbose:
+                self._print(f"Warning: Failed to save dedup index - {e}", self.c.YELLOW)
+        return hashes
+
+    @profiled("dedup_record")
+    def _record_dedup_hashes(self, filepath, new_hashes, reset=False):
+        """写入日志后追加哈希，并记录日志的最新 mtime/size"""
+        st = os.stat(filepath)
+        cached = self._dedup_cache.get(filepath)
+        hashes = set() if reset or not cached else cached[1]
+        hashes.update(new_hashes)
+        self._dedup_cache[filepath] = ((st.st_mtime_ns, st.st_size), hashes)
+
+        sidecar = self._dedup_sidecar(filepath)
+        try:
+            ensure_dir(os.path.dirname(sidecar))
+            with open(sidecar, "w" if reset else "a", encoding="utf-8") as f:
+                f.write("".join(f"{h} {st.st_mtime_ns} {st.st_size}\n" for h in new_hashes))
+        except OSError as e:
+            if self.verbose:
+                self._print(f"Warning: Failed to update dedup index - {e}", self.c.YELLOW)
+
     def is_duplicate(self, filepath, content, category):
         """
         检查是否重复记录
-        策略：解析已有条目，检查同一天的相同类别+标题
+        策略：查询当天 (分类, 标题) 的哈希集合，O(1) 精确匹配
         """
         if not os.path.exists(filepath):
             return False
 
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                content_lines = f.readlines()
-
-            # 获取今天的日期字符串
-            today = datetime.date.today().strftime("%Y-%m-%d")
-
-            # 查找今天的所有条目
-            for i, line in enumerate(content_lines):
-                if line.startswith(f"# 📅 {today}"):
-                    # 从这里开始检查今天的条目
-                    for j in range(i + 1, len(content_lines)):
-                        entry_line = content_lines[j]
-                        # 遇到新的一天或文件结束
-                        if entry_line.startswith("# 📅"):
-                            break
-                        # 检查是否是相同条目
-                        if entry_line.startswith("### "):
-                            pattern = f"{category.upper()}: {content}"
-                            if pattern in entry_line:
-                                return True
-            return False
-
+            return self.dedup_hash(category, content) in self._load_dedup_hashes(filepath)
         except (IOError, UnicodeDecodeError) as e:
             if self.verbose:
                 self._print(f"Warning: Duplicate check failed - {e}", self.c.YELLOW)
             return False
 
+    @profiled("determine_path")
     def determine_path(self, use_current_dir, custom_dir):
         """
         决定存储路径
@@ -222,20 +1541,56 @@ class Logger:
         # 1. 用户自定义路径
         if custom_dir:
             target = os.path.abspath(os.path.expanduser(custom_dir))
-            Path(target).mkdir(parents=True, exist_ok=True)
+            ensure_dir(target)
             return target, "custom"
 
         # 2. 当前项目本地
         if use_current_dir:
             target = os.path.join(os.getcwd(), LOCAL_DIR_NAME)
-            Path(target).mkdir(parents=True, exist_ok=True)
+            ensure_dir(target)
             return target, "local"
 
         # 3. 全局默认（从配置读取）
-        global_dir = self.config.global_dir
-        Path(global_dir).mkdir(parents=True, exist_ok=True)
+        #    转为绝对路径：守护进程的 group-commit 队列稍后在它自己的 cwd 下写入
+        global_dir = os.path.abspath(os.path.expanduser(self.config.global_dir))
+        ensure_dir(global_dir)
         return global_dir, "global"
 
+    def log_dirs(self, use_current_dir=False, custom_dir=None, all_roots=False):
+        """
+        要读取的日志目录列表
+        all_roots=True 时为全局目录 + 工作区根目录下找到的所有项目 .devlog（按真实路径去重）
+        """
+        if not all_roots:
+            return [self.determine_path(use_current_dir, custom_dir)[0]]
+
+        global_dir, _ = self.determine_path(False, None)
+        dirs = [global_dir]
+        roots = self.config.workspace_roots
+        if roots:
+            dirs += WorkspaceScanner(os.path.join(global_dir, CACHE_DIR_NAME)).discover(roots)
+        elif self.verbose:
+            self._print("Warning: No workspace_roots configured, --all only reads the global dir", self.c.YELLOW)
+
+        unique = {}
+        for path in dirs:
+            unique.setdefault(os.path.realpath(path), path)
+        return list(unique.values())
+
+    @staticmethod
+    def merge_entries(entries):
+        """合并多个目录的 [(date_str, item), ...]：去掉重复条目，按日期倒序、同一天按时间排列"""
+        seen = set()
+        merged = []
+        for date_str, item in entries:
+            key = (date_str, item["time"], item["category"], item["title"])
+            if key not in seen:
+                seen.add(key)
+                merged.append((date_str, item))
+        merged.sort(key=lambda entry: entry[1]["time"])
+        merged.sort(key=lambda entry: entry[0], reverse=True)
+        return merged
+
     def format_entry(self, timestamp, project, category, content, detail):
         """格式化单条日志"""
         cat_info = self.CATEGORIES.get(category, self.CATEGORIES["misc"])
@@ -252,8 +1607,91 @@ class Logger:
 
         return "\n".join(lines) + "\n"
 
-    def write(self, category, content, detail, use_current_dir, custom_dir):
-        """写入日志"""
+    def append_entries(self, base_dir, records, sync=False):
+        """
+        批量追加条目，records 为 dict: category/title/detail/date/time/project
+        按日期分组：每个文件加锁一次、加载一次防重集合、一次缓冲写入
+        sync=True 时释放锁前 fsync（新建文件还会 fsync 目录），返回时条目已落盘
+        返回 (imported, skipped)
+        """
+        groups = {}
+        for record in records:
+            groups.setdefault(record["date"], []).append(record)
+
+        imported = skipped = 0
+        for date_str, group in groups.items():
+            filepath = os.path.join(base_dir, f"{date_str}.md")
+            with LockedAppend(filepath) as fd:
+                is_new = os.fstat(fd).st_size == 0
+                seen = set(self._load_dedup_hashes(filepath))
+                chunks = [f"# 📅 {date_str} Work Log\n\n"] if is_new else []
+                new_hashes = []
+                for record in group:
+                    h = self.dedup_hash(record["category"], record["title"])
+                    if h in seen:
+                        skipped += 1
+                        continue
+                    seen.add(h)
+                    new_hashes.append(h)
+                    chunks.append(self.format_entry(
+                        record["time"], record["project"], record["category"],
+                        record["title"], record["detail"]
+                    ) + "\n")  # 条目间隔
+
+                if new_hashes:
+                    with PROFILER.phase("append"):
+                        append_atomic(fd, "".join(chunks))
+                    if sync:
+                        with PROFILER.phase("fsync"):
+                            os.fsync(fd)
+                            if is_new:
+                                fsync_dir(base_dir)
+                    # 新建文件时重写整个 sidecar：已归档的同一天的哈希（已在 seen 中）也要保留
+                    self._record_dedup_hashes(filepath, seen if is_new else new_hashes, reset=is_new)
+                    imported += len(new_hashes)
+        return imported, skipped
+
+    def enable_write_behind(self):
+        """
+        长驻进程（守护进程、Python API）调用：durability 为 group-commit 时启用后台批量写入
+        单次运行的 CLI 不启用，group-commit 退化为每次调用写入后 fsync 一次
+        """
+        if self._write_queue is None and self.config.durability == "group-commit":
+            window, max_entries = self.config.group_commit
+            self._write_queue = WriteQueue(self, window, max_entries)
+        return self._write_queue
+
+    def flush(self):
+        """立即写入 group-commit 队列中的条目"""
+        if self._write_queue:
+            self._write_queue.flush()
+
+    def close(self):
+        """写完队列中剩余条目并停止后台线程"""
+        if self._write_queue:
+            self._write_queue.close()
+            self._write_queue = None
+
+    def find_near_duplicate(self, base_dir, record):
+        """启用近似重复检测时，返回最相似的已有条目 (相似度, date, time, category, title)；否则 None"""
+        near_dup = self.config.near_dup
+        if not near_dup:
+            return None
+        import sqlite3
+
+        try:
+            index = NearDupIndex(base_dir, self, *near_dup)
+            try:
+                return index.find(record["category"], record["title"], record["detail"], record["date"])
+            finally:
+                index.close()
+        except (sqlite3.Error, OSError) as e:
+            if self.verbose:
+                self._print(f"Warning: Near-duplicate check failed - {e}", self.c.YELLOW)
+            return None
+
+    def write(self, category, content, detail, use_current_dir, custom_dir, force=False):
+        """写入日志（force 跳过近似重复检测）"""
         # 1. 验证分类
         if category not in self.CATEGORIES:
             self._print(f"Error: Invalid category '{category}'", self.c.YELLOW)
@@ -262,42 +1700,141 @@ class Logger:
 
         # 2. 确定路径
         base_dir, location_type = self.determine_path(use_current_dir, custom_dir)
-        today = datetime.date.today().strftime("%Y-%m-%d")
-        filepath = os.path.join(base_dir, f"{today}.md")
+        now = datetime.datetime.now()
+        record = {
+            "category": category,
+            "title": content,
+            "detail": detail,
+            "date": now.strftime("%Y-%m-%d"),
+            "time": now.strftime("%H:%M"),
+            "project": f"@{self.get_project_context()}",
+        }
+        filepath = os.path.join(base_dir, f"{record['date']}.md")
+
+        # 3. 近似重复：最近几天已记过相似的内容时跳过（-f 强制写入）
+        match = None if force else self.find_near_duplicate(base_dir, record)
+        if match:
+            similarity, date_str, time_str, cat, title = match
+            self._print(f"{self.c.YELLOW}⚠️  Skipped: similar to {date_str} [{time_str}] "
+                        f"{cat.upper()}: {title} ({similarity:.0%} similar, use -f to write anyway){self.c.RED}")
+            return 0
+
+        # 4. 加锁后防重检查 + 写入（表头和条目一次性追加，避免并发交错）
+        #    group-commit 的长驻进程只入队，由后台线程批量写入（入队前对照文件和队列防重）；
+        #    转发来的请求用 DEVLOG_DURABILITY 要求其他策略时，先写完队列再直接写入
+        if self._write_queue and self.config.durability == "group-commit":
+            if not self._write_queue.put(base_dir, record):
+                self._print(f"{self.c.YELLOW}⚠️  Skipped: Log already exists today{self.c.RED}")
+                return 0
+            self.print_feedback(filepath, category, content, detail, location_type, queued=True)
+            return 0
+        if self._write_queue:
+            self._write_queue.flush()
+        try:
+            imported, _ = self.append_entries(base_dir, [record], sync=self.config.durability != "none")
+        except IOError as e:
+            print(f"{self.c.RED}❌ Error: Failed to write log - {e}{self.c.RED}", file=sys.stderr)
+            return 1
 
-        # 3. 防重检查
-        if self.is_duplicate(filepath, content, category):
+        if not imported:
             self._print(f"{self.c.YELLOW}⚠️  Skipped: Log already exists today{self.c.RED}")
             return 0
 
-        # 4. 构造内容
-        timestamp = datetime.datetime.now().strftime("%H:%M")
-        project = f"@{self.get_project_context()}"
-        entry = self.format_entry(timestamp, project, category, content, detail)
+        # 5. 输出反馈
+        self.print_feedback(filepath, category, content, detail, location_type)
+        return 0
+
+    def normalize_record(self, raw):
+        """
+        校验并补全一条导入记录（title 也可写作 content）
+        缺省 date/time 为当前时间，project 为当前项目；非法时抛 ValueError
+        """
+        if not isinstance(raw, dict):
+            raise ValueError("record must be a JSON object")
+
+        category = str(raw.get("category", "")).lower()
+        if category not in self.CATEGORIES:
+            raise ValueError(f"invalid category '{raw.get('category')}'")
+
+        title = str(raw.get("title") or raw.get("content") or "").strip()
+        if not title or "\n" in title:
+            raise ValueError("title must be a non-empty single line")
+
+        now = datetime.datetime.now()
+        date_str = str(raw.get("date") or now.strftime("%Y-%m-%d"))
+        time_str = str(raw.get("time") or now.strftime("%H:%M"))
+        try:
+            parsed = datetime.datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M")
+        except ValueError:
+            raise ValueError(f"invalid date/time '{date_str} {time_str}'")
+        # strptime 也接受 "2025-3-2" / "9:5"，统一补零，否则文件名和标题行都无法被识别
+        date_str, time_str = parsed.strftime("%Y-%m-%d"), parsed.strftime("%H:%M")
+
+        project = str(raw.get("project") or self.get_project_context())
+        if not project.startswith("@"):
+            project = f"@{project}"
+
+        return {
+            "category": category,
+            "title": title,
+            "detail": str(raw.get("detail") or ""),
+            "date": date_str,
+            "time": time_str,
+            "project": project,
+        }
+
+    def import_entries(self, source, use_current_dir=False, custom_dir=None):
+        """从 JSONL 文件（或 '-' 表示 stdin）批量导入"""
+        import json
 
-        # 5. 写入文件
-        is_new = not os.path.exists(filepath)
+        base_dir, location_type = self.determine_path(use_current_dir, custom_dir)
+
+        records = []
+        invalid = 0
         try:
-            with open(filepath, "a", encoding="utf-8") as f:
-                if is_new:
-                    f.write(f"# 📅 {today} Work Log\n\n")
-                f.write(entry)
-                f.write("\n")  # 条目间隔
+            stream = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
         except IOError as e:
-            self._print(f"{self.c.RED}❌ Error: Failed to write log - {e}{self.c.RED}", file=sys.stderr)
+            print(f"{self.c.RED}❌ Error: Failed to open {source} - {e}{self.c.RED}", file=sys.stderr)
             return 1
 
-        # 6. 输出反馈
-        self.print_feedback(filepath, category, content, detail, location_type)
-        return 0
+        with stream:
+            for line_no, line in enumerate(stream, 1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append(self.normalize_record(json.loads(line)))
+                except ValueError as e:
+                    invalid += 1
+                    self._print(f"Warning: line {line_no} ignored - {e}", self.c.YELLOW)
+
+        try:
+            imported, skipped = self.append_entries(base_dir, records, sync=self.config.durability != "none")
+        except IOError as e:
+            print(f"{self.c.RED}❌ Error: Failed to write log - {e}{self.c.RED}", file=sys.stderr)
+            return 1
 
-    def print_feedback(self, filepath, category, content, detail, location_type):
-        """打印结构化反馈"""
+        days = len({record["date"] for record in records})
+        print()
+        print(f"{self.c.GREEN}{self.c.BOLD}✅ Import Finished{self.c.RED}")
+        print(f"📂 Path:     {base_dir}")
+        print(f"📥 Imported: {imported}  ({days} day files)")
+        print(f"⏭️  Skipped:  {skipped} duplicates")
+        if invalid:
+            print(f"⚠️  Invalid:  {invalid}")
+        print(f"📍 Scope:    {location_type.upper()}")
+        print("-" * 40)
+        return 1 if invalid and not records else 0
+
+    def print_feedback(self, filepath, category, content, detail, location_type, queued=False):
+        """打印结构化反馈（queued 表示已进入 group-commit 队列、尚未落盘）"""
         cat_info = self.CATEGORIES.get(category, self.CATEGORIES["misc"])
         emoji = cat_info["emoji"]
 
         print()
-        print(f"{self.c.GREEN}{self.c.BOLD}✅ Log Saved Successfully{self.c.RED}")
+        if queued:
+            print(f"{self.c.GREEN}{self.c.BOLD}✅ Log Queued (group-commit){self.c.RED}")
+        else:
+            print(f"{self.c.GREEN}{self.c.BOLD}✅ Log Saved Successfully{self.c.RED}")
         print(f"📂 Path:    {filepath}")
         print(f"🏷️  Type:    {emoji} {category.upper()} - {cat_info['desc']}")
         print(f"📝 Content: {content}")
@@ -307,174 +1844,1106 @@ class Logger:
         print(f"📍 Scope:   {location_type.upper()}")
         print("-" * 40)
 
-    def list_today(self, use_current_dir, custom_dir):
-        """列出今天的日志"""
-        base_dir, _ = self.determine_path(use_current_dir, custom_dir)
-        today = datetime.date.today().strftime("%Y-%m-%d")
-        filepath = os.path.join(base_dir, f"{today}.md")
-
-        if not os.path.exists(filepath):
-            self._print(f"{self.c.GRAY}No logs found for today.{self.c.RED}")
+    def list_today(self, use_current_dir, custom_dir, all_roots=False, date_str=None, category=None,
+                   project=None, limit=None, offset=0, reverse=False):
+        """
+        列出某天（默认今天）的日志
+        不带过滤 / 分页参数时原样输出日志文件；否则边解析边过滤，取满一页即停止读取，
+        reverse 时从文件末尾向前分块读取，"最后 N 条" 不必扫描整个文件
+        """
+        date_str = date_str or datetime.date.today().strftime("%Y-%m-%d")
+        label = "Today's Logs" if date_str == datetime.date.today().strftime("%Y-%m-%d") else f"Logs {date_str}"
+        if project and not project.startswith("@"):
+            project = f"@{project}"
+
+        def wanted(item):
+            return (not category or item["category"] == category) and (not project or item["project"] == project)
+
+        if all_roots:
+            base_dirs = self.log_dirs(all_roots=True)
+            entries = []
+            for base_dir in base_dirs:
+                entries.extend((date_str, item) for item in self.load_day(base_dir, date_str) or [])
+            items = [item for _, item in self.merge_entries(entries) if wanted(item)]
+            source = f"{len(base_dirs)} log dirs"
+            if reverse:
+                items.reverse()
+        else:
+            base_dir, _ = self.determine_path(use_current_dir, custom_dir)
+            filepath = os.path.join(base_dir, f"{date_str}.md")
+            source = filepath
+            if day_stamp(base_dir, date_str) is None:
+                self._print(f"{self.c.GRAY}No logs found for {date_str}.{self.c.RED}")
+                return 0
+            if not (category or project or limit or offset or reverse):
+                self._print(f"\n{self.c.BOLD}📋 {label} ({filepath}){self.c.RED}\n")
+                with PROFILER.phase("read"):
+                    for line in read_day_lines(filepath):
+                        sys.stdout.write(line)
+                    print()
+                return 0
+            items = self.iter_log_entries_reverse(filepath) if reverse else self.iter_log_entries(filepath)
+            items = filter(wanted, items)
+
+        import itertools
+
+        # 多取一条，用来判断后面是否还有
+        stop = offset + limit + 1 if limit else None
+        page = list(itertools.islice(items, offset, stop))
+        more = bool(limit) and len(page) > limit
+        page = page[:limit] if limit else page
+
+        if not page:
+            self._print(f"{self.c.GRAY}No matching logs found for {date_str}.{self.c.RED}")
             return 0
 
-        self._print(f"\n{self.c.BOLD}📋 Today's Logs ({filepath}){self.c.RED}\n")
-        with open(filepath, "r", encoding="utf-8") as f:
-            print(f.read())
+        self._print(f"\n{self.c.BOLD}📋 {label} ({source}){self.c.RED}\n")
+        print(f"# 📅 {date_str} Work Log\n")
+        for item in page:
+            print(self.format_entry(item["time"], item["project"], item["category"], item["title"], item["detail"]))
+        if more:
+            self._print(f"{self.c.GRAY}… more entries: --offset {offset + limit}{self.c.RED}")
         return 0
 
-    def parse_log_file(self, filepath):
-        """解析日志文件，返回按分类聚合的条目"""
-        if not os.path.exists(filepath):
-            return {}
+    def tail(self, follow=False, lines=10, category=None, project=None, interval=1.0,
+             use_current_dir=False, custom_dir=None):
+        """
+        输出今天最后 lines 条日志；follow 时持续输出新追加的条目
+        只解析上次读到的字节偏移之后的新内容，跨过零点自动切换到新一天的文件
+        Linux 上用 inotify 等待写入，其他平台按 interval 秒轮询
+        """
+        import collections
 
-        entries = {cat: [] for cat in self.CATEGORIES.keys()}
+        base_dir, _ = self.determine_path(use_current_dir, custom_dir)
+        if project and not project.startswith("@"):
+            project = f"@{project}"
+
+        def wanted(item):
+            return (not category or item["category"] == category) and (not project or item["project"] == project)
+
+        def show(items):
+            for item in items:
+                emoji = self.CATEGORIES[item["category"]]["emoji"]
+                print(f"{self.c.GRAY}{item['time']}{self.c.RED} {emoji} {item['category'].upper()}: "
+                      f"{item['title']} {self.c.GRAY}{item['project']}{self.c.RED}")
+                for line in item["detail"].splitlines():
+                    print(f"    {line}")
+            sys.stdout.flush()
+
+        follower = DayFollower(base_dir, datetime.date.today().strftime("%Y-%m-%d"))
+        show(collections.deque(filter(wanted, follower.poll()), maxlen=max(lines, 0)))
+        if not follow:
+            return 0
 
+        watch_fd = _inotify_watch(base_dir)
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+            while True:
+                _wait_for_change(watch_fd, interval)
+                today = datetime.date.today().strftime("%Y-%m-%d")
+                if today != follower.date_str:
+                    show(filter(wanted, follower.poll()))  # 读完前一天最后追加的内容
+                    follower = DayFollower(base_dir, today)
+                    print(f"{self.c.BOLD}📅 {today}{self.c.RED}")
+                show(filter(wanted, follower.poll()))
+        except KeyboardInterrupt:
+            return 0
+        finally:
+            if watch_fd is not None:
+                os.close(watch_fd)
 
-            current_detail = []
-            current_entry = None
+    def iter_log_entries(self, filepath):
+        """
+        流式解析日志文件，逐条产出条目（已归档的日子透明地从月度归档读取）
+        单个预编译正则一次提取时间、项目、分类和标题，调用方可随时停止
+        """
+        parser = EntryParser()
+        try:
+            yield from parser.feed(read_day_lines(filepath))
+            item = parser.flush()
+            if item:
+                yield item
 
-            for line in lines:
-                if line.startswith("### "):
-                    # 保存前一个条目的 detail
-                    if current_entry:
-                        entries[current_entry["category"]].append({
-                            "title": current_entry["title"],
-                            "time": current_entry["time"],
-                            "project": current_entry["project"],
-                            "detail": "\n".join(current_detail).strip()
-                        })
-
-                    # 解析新条目: ### [14:30] `@project` CATEGORY: title
-                    current_entry = None
-                    current_detail = []
-
-                    # 提取 category 和 title
-                    for cat in self.CATEGORIES.keys():
-                        cat_pattern = f"{cat.upper()}: "
-                        if cat_pattern in line:
-                            title = line.split(cat_pattern)[1].strip()
-                            current_entry = {
-                                "category": cat,
-                                "title": title,
-                                "time": "未知",
-                                "project": "未知"
-                            }
-                            # 提取时间
-                            time_match = re.search(r'\[(\d{2}:\d{2})\]', line)
-                            if time_match:
-                                current_entry["time"] = time_match.group(1)
-                            # 提取项目
-                            proj_match = re.search(r'`(@[^`]+)`', line)
-                            if proj_match:
-                                current_entry["project"] = proj_match.group(1)
-                            break
-
-                elif line.startswith("> ") and current_entry:
-                    current_detail.append(line[2:].strip())
-
-            # 保存最后一个条目
-            if current_entry:
-                entries[current_entry["category"]].append({
-                    "title": current_entry["title"],
-                    "time": current_entry["time"],
-                    "project": current_entry["project"],
-                    "detail": "\n".join(current_detail).strip()
-                })
+        except (IOError, UnicodeDecodeError) as e:
+            if self.verbose:
+                self._print(f"Warning: Failed to parse {filepath} - {e}", self.c.YELLOW)
 
+    def iter_log_entries_reverse(self, filepath):
+        """从文件末尾向前逐条产出条目（最新的在前），调用方取够即可停止"""
+        pending = []  # 倒序收集的细节行
+        try:
+            for line in read_day_lines_reverse(filepath):
+                if not line.startswith("### "):
+                    pending.append(line)
+                    continue
+                parser = EntryParser()
+                pending.append(line)
+                pending.reverse()
+                for item in parser.feed(pending):
+                    yield item
+                item = parser.flush()
+                if item:
+                    yield item
+                pending = []
         except (IOError, UnicodeDecodeError) as e:
             if self.verbose:
                 self._print(f"Warning: Failed to parse {filepath} - {e}", self.c.YELLOW)
 
+    @profiled("parse")
+    def parse_log_file(self, filepath):
+        """解析日志文件，返回按分类聚合的条目"""
+        base_dir, name = os.path.split(filepath)
+        if day_stamp(base_dir, name[:-3]) is None:
+            return {}
+
+        entries = {cat: [] for cat in self.CATEGORIES.keys()}
+        for item in self.iter_log_entries(filepath):
+            entries[item["category"]].append(item)
         return entries
 
-    def generate_weekly(self, days=7, use_current_dir=False, custom_dir=None):
-        """生成周报"""
-        base_dir, _ = self.determine_path(use_current_dir, custom_dir)
+    def summary_cache(self, base_dir):
+        """base_dir 对应的每日解析缓存；配置为 0 时返回 None"""
+        max_mb = self.config.summary_cache_mb
+        if max_mb <= 0:
+            return None
+        cache = self._summary_caches.get(base_dir)
+        if cache is None:
+            cache = self._summary_caches[base_dir] = SummaryCache(base_dir, self, max_mb)
+        return cache
+
+    def load_day(self, base_dir, date_str, cache=None):
+        """读取一天的条目（有缓存时走缓存），日志不存在时返回 None"""
+        if cache:
+            return cache.load(date_str)
+        if day_stamp(base_dir, date_str) is None:
+            return None
+        return list(self.iter_log_entries(os.path.join(base_dir, f"{date_str}.md")))
+
+    def collect_entries(self, base_dir, days):
+        """
+        收集最近 days 天的条目
+        返回 (EntryTable, date_range)，均按日期倒序
+        """
+        dates = [
+            (datetime.date.today() - datetime.timedelta(days=i)).strftime("%Y-%m-%d")
+            for i in range(days)
+        ]
 
-        # 收集指定天数内的日志
-        all_entries = {cat: [] for cat in self.CATEGORIES.keys()}
+        if self.config.use_index and dates:
+            import sqlite3
+
+            try:
+                index = EntryIndex(base_dir, self)
+                try:
+                    index.refresh(dates)
+                    return index.entries_between(dates[-1], dates[0]), index.dates_between(dates[-1], dates[0])
+                finally:
+                    index.close()
+            except (sqlite3.Error, OSError) as e:
+                if self.verbose:
+                    self._print(f"Warning: Index unavailable, falling back to parsing - {e}", self.c.YELLOW)
+
+        table = EntryTable()
         date_range = []
 
-        for i in range(days):
-            date = datetime.date.today() - datetime.timedelta(days=i)
-            date_str = date.strftime("%Y-%m-%d")
-            filepath = os.path.join(base_dir, f"{date_str}.md")
+        # 未变化的日子直接读每日缓存，通常只有今天需要重新解析
+        cache = self.summary_cache(base_dir)
+        for date_str in dates:
+            items = self.load_day(base_dir, date_str, cache)
+            if items is None:
+                continue
+            date_range.append(date_str)
+            table.add_day(date_str, items)
+
+        if cache:
+            cache.evict()
+        return table, date_range
+
+    @profiled("load_days")
+    def load_days(self, base_dir, dates, jobs=None, processes=False):
+        """
+        并行解析多个日志文件，按 dates 顺序装入 EntryTable，返回 (table, 有条目的日期)
+        默认线程池（适合网络文件系统等 IO 瓶颈），processes=True 时用进程池（CPU 瓶颈）
+        解析结果边产出边装表，每天的 dict 用完即释放，不会同时持有整个范围
+        """
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        table = EntryTable()
+        date_range = []
+
+        def add(days):
+            for date_str, items in days:
+                if items:
+                    date_range.append(date_str)
+                    table.add_day(date_str, items)
+
+        if processes and len(dates) > 1:
+            paths = [os.path.join(base_dir, f"{date_str}.md") for date_str in dates]
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                add(zip(dates, pool.map(_parse_day_file, paths, chunksize=16)))
+            return table, date_range
 
-            if os.path.exists(filepath):
-                date_range.append(date_str)
-                entries = self.parse_log_file(filepath)
-                for cat, items in entries.items():
-                    all_entries[cat].extend([(date_str, item) for item in items])
+        cache = self.summary_cache(base_dir)
 
-        # 生成周报
+        def load(date_str):
+            return self.load_day(base_dir, date_str, cache) or []
+
+        if len(dates) <= 1:
+            add((date_str, load(date_str)) for date_str in dates)
+        else:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                add(zip(dates, pool.map(load, dates)))
+
+        if cache:
+            cache.evict()
+        return table, date_range
+
+    def iter_entries(self, base_dir, since=None, until=None):
+        """
+        按日期顺序逐条产出 [since, until] 内的 (date_str, item)
+        一次只解析一个文件、一次只持有一条，不构建按分类聚合的大字典
+        """
+        for date_str in sorted(scan_day_files(base_dir)):
+            if (since and date_str < since) or (until and date_str > until):
+                continue
+            for item in self.iter_log_entries(os.path.join(base_dir, f"{date_str}.md")):
+                yield date_str, item
+
+    @profiled("export")
+    def export(self, fmt="jsonl", since=None, until=None, output=None, use_current_dir=False, custom_dir=None):
+        """流式导出条目为 jsonl / csv / html，写到 output 文件（缺省为 stdout）"""
+        base_dir, _ = self.determine_path(use_current_dir, custom_dir)
+        entries = self.iter_entries(base_dir, since, until)
+        write = EXPORT_FORMATS[fmt]
+
+        if not output:
+            write(sys.stdout, entries)
+            return 0
+
+        try:
+            with open(output, "w", encoding="utf-8", newline="") as f:
+                count = write(f, entries)
+        except IOError as e:
+            print(f"{self.c.RED}❌ Error: Failed to export - {e}{self.c.RED}", file=sys.stderr)
+            return 1
+        self._print(f"{self.c.GREEN}✅ Exported {count} entries to {output}{self.c.RED}")
+        return 0
+
+    def print_report(self, title, table, date_range, empty_message):
+        """输出按分类汇总的报告（周报、月报等共用）"""
         print()
         print(f"{self.c.BOLD}{self.c.BLUE}{'=' * 50}{self.c.RED}")
-        print(f"{self.c.BOLD}📊 周 报 / Weekly Report{self.c.RED}")
+        print(f"{self.c.BOLD}{title}{self.c.RED}")
         print(f"{self.c.BLUE}{'=' * 50}{self.c.RED}")
         print()
 
         if not date_range:
-            self._print(f"{self.c.GRAY}No logs found in the past {days} days.{self.c.RED}")
+            self._print(f"{self.c.GRAY}{empty_message}{self.c.RED}")
             return 0
 
         # 按分类输出
         category_order = ["incident", "feat", "design", "ops", "bug", "learn", "misc"]
+        groups = table.rows_by_category()
+        titles, details = table.titles, table.details
 
         for cat in category_order:
-            items = all_entries[cat]
-            if not items:
+            rows = groups[cat]
+            if not rows:
                 continue
 
             cat_info = self.CATEGORIES[cat]
-            print(f"{cat_info['emoji']} **{cat_info['desc']}** ({len(items)})")
+            print(f"{cat_info['emoji']} **{cat_info['desc']}** ({len(rows)})")
             print()
 
-            for date_str, item in items:
-                detail_preview = item["detail"][:60] + "..." if item["detail"] and len(item["detail"]) > 60 else (item["detail"] or "")
-                print(f"  - {item['title']}")
+            for i in rows:
+                detail = details[i]
+                detail_preview = detail[:60] + "..." if detail and len(detail) > 60 else (detail or "")
+                print(f"  - {titles[i]}")
                 if detail_preview:
                     print(f"    <small>{detail_preview}</small>")
             print()
 
         # 日期范围
         print(f"{self.c.GRAY}{'─' * 40}{self.c.RED}")
-        print(f"{self.c.GRAY}📅 {date_range[-1]} ~ {date_range[0]}  |  共 {len(date_range)} 天有记录{self.c.RED}")
+        print(f"{self.c.GRAY}📅 {min(date_range)} ~ {max(date_range)}  |  共 {len(date_range)} 天有记录{self.c.RED}")
         print()
 
         return 0
 
+    def generate_weekly(self, days=7, use_current_dir=False, custom_dir=None, all_roots=False):
+        """生成周报（all_roots 时合并全局目录和所有项目 .devlog）"""
+        base_dirs = self.log_dirs(use_current_dir, custom_dir, all_roots)
+
+        # 收集指定天数内的日志
+        if len(base_dirs) == 1:
+            table, date_range = self.collect_entries(base_dirs[0], days)
+        else:
+            tables = []
+            dates = set()
+            for base_dir in base_dirs:
+                entries, date_range = self.collect_entries(base_dir, days)
+                tables.append(entries)
+                dates.update(date_range)
+            table = EntryTable.merge(tables)
+            date_range = sorted(dates, reverse=True)
+
+        return self.print_report(
+            "📊 周 报 / Weekly Report", table, date_range,
+            f"No logs found in the past {days} days.",
+        )
+
+    def generate_report(self, since=None, until=None, title="📊 报 告 / Report", jobs=None,
+                        processes=False, use_current_dir=False, custom_dir=None):
+        """
+        生成任意日期范围的报告（月报、年报等）
+        只列一次目录挑出范围内的日志文件，并行解析后按日期顺序合并
+        """
+        base_dir, _ = self.determine_path(use_current_dir, custom_dir)
+        until = until or datetime.date.today().strftime("%Y-%m-%d")
+
+        dates = sorted(
+            date_str for date_str in scan_day_files(base_dir)
+            if (since is None or date_str >= since) and date_str <= until
+        )
+
+        table, date_range = self.load_days(base_dir, dates, jobs, processes)
+        return self.print_report(
+            title, table, date_range,
+            f"No logs found between {since or 'the beginning'} and {until}.",
+        )
 
-def parse_arguments():
+    def search(self, terms, category=None, project=None, since=None, limit=50,
+               use_current_dir=False, custom_dir=None, all_roots=False):
+        """全文检索标题和细节（增量刷新倒排索引后查询；all_roots 时逐个目录查询再合并）"""
+        import sqlite3
+
+        base_dirs = self.log_dirs(use_current_dir, custom_dir, all_roots)
+        if project and not project.startswith("@"):
+            project = f"@{project}"
+
+        results = []
+        for base_dir in base_dirs:
+            try:
+                index = EntryIndex(base_dir, self)
+                try:
+                    index.refresh()
+                    results.extend(index.search(terms, category, project, since, limit))
+                finally:
+                    index.close()
+            except (sqlite3.Error, OSError) as e:
+                self._print(f"Error: Search index unavailable for {base_dir} - {e}", self.c.YELLOW)
+                return 1
+        if len(base_dirs) > 1:
+            results = self.merge_entries(results)[:limit]
+
+        query = " ".join(terms)
+        if not results:
+            self._print(f"{self.c.GRAY}No logs found for \"{query}\".{self.c.RED}")
+            return 0
+
+        self._print(f"\n{self.c.BOLD}🔍 Search: {query} ({len(results)}){self.c.RED}\n")
+        for date_str, item in results:
+            emoji = self.CATEGORIES[item["category"]]["emoji"]
+            print(f"{self.c.GRAY}{date_str} {item['time']}{self.c.RED} {emoji} "
+                  f"{item['category'].upper()}: {item['title']} {self.c.GRAY}{item['project']}{self.c.RED}")
+            if item["detail"]:
+                detail_preview = item["detail"].replace("\n", " ")
+                if len(detail_preview) > 60:
+                    detail_preview = detail_preview[:60] + "..."
+                print(f"    {detail_preview}")
+        print()
+        return 0
+
+    def _bar(self, n, max_n, width=30):
+        """文本条形图"""
+        filled = round(n / max_n * width) if max_n else 0
+        return "█" * filled or ("▏" if n else "")
+
+    def stats(self, since=None, until=None, top=10, use_current_dir=False, custom_dir=None):
+        """全量统计：分类、项目、日期、时段分布及故障趋势（基于增量索引的每日计数）"""
+        import sqlite3
+
+        base_dir, _ = self.determine_path(use_current_dir, custom_dir)
+        try:
+            index = EntryIndex(base_dir, self)
+            try:
+                index.refresh()
+                data = index.stats(since, until, top)
+            finally:
+                index.close()
+        except (sqlite3.Error, OSError) as e:
+            self._print(f"Error: Stats index unavailable - {e}", self.c.YELLOW)
+            return 1
+
+        print()
+        print(f"{self.c.BOLD}{self.c.BLUE}{'=' * 50}{self.c.RED}")
+        print(f"{self.c.BOLD}📈 统 计 / Stats{self.c.RED}")
+        print(f"{self.c.BLUE}{'=' * 50}{self.c.RED}")
+        print()
+
+        if not data["entries"]:
+            self._print(f"{self.c.GRAY}No logs found.{self.c.RED}")
+            return 0
+
+        print(f"📅 {data['first']} ~ {data['last']}  |  {data['days']} 天  |  {data['entries']} 条  |  "
+              f"平均 {data['entries'] / data['days']:.1f} 条/天")
+        print()
+
+        print(f"{self.c.BOLD}分类 / Category{self.c.RED}")
+        max_n = max(n for _, n in data["category"])
+        for cat, n in data["category"]:
+            cat_info = self.CATEGORIES.get(cat, self.CATEGORIES["misc"])
+            print(f"  {cat_info['emoji']} {cat:<9}{n:>7}  {self._bar(n, max_n)}")
+        print()
+
+        print(f"{self.c.BOLD}项目 / Project (top {top}){self.c.RED}")
+        max_n = max((n for _, n in data["project"]), default=0)
+        for project, n in data["project"]:
+            print(f"  {project:<24}{n:>7}  {self._bar(n, max_n)}")
+        print()
+
+        if data["hour"]:
+            print(f"{self.c.BOLD}时段 / Hour of day{self.c.RED}")
+            max_n = max(n for _, n in data["hour"])
+            for hour, n in data["hour"]:
+                print(f"  {hour}:00 {n:>7}  {self._bar(n, max_n)}")
+            print()
+
+        print(f"{self.c.BOLD}最忙的日子 / Busiest days{self.c.RED}")
+        for date_str, n in data["busiest_days"]:
+            print(f"  {date_str}  {n:>5}")
+        print()
+
+        if data["incident_months"]:
+            print(f"{self.c.BOLD}🚨 故障趋势 / Incidents per month{self.c.RED}")
+            max_n = max(n for _, n in data["incident_months"])
+            for month, n in data["incident_months"][-24:]:
+                print(f"  {month} {n:>5}  {self._bar(n, max_n)}")
+            print()
+        return 0
+
+    def archive(self, older_than=30, dry_run=False, use_current_dir=False, custom_dir=None):
+        """
+        把 older_than 天以前的日志按月打包进 archive/YYYY-MM.zip（deflate 压缩）并删除原文件
+        已有归档的月份合并后整体重写；打包期间持有这些日志文件的锁，并发写入不会丢失
+        按字节读取和存储，原文（包括 CRLF 换行）原样保留
+        """
+        import contextlib
+        import zipfile
+
+        base_dir, location_type = self.determine_path(use_current_dir, custom_dir)
+        cutoff = (datetime.date.today() - datetime.timedelta(days=max(older_than, 0))).strftime("%Y-%m-%d")
+
+        months = {}
+        for date_str in sorted(scan_day_files(base_dir, archived=False)):
+            if date_str < cutoff:
+                months.setdefault(date_str[:7], []).append(date_str)
+
+        if not months:
+            self._print(f"{self.c.GRAY}Nothing to archive before {cutoff}.{self.c.RED}")
+            return 0
+
+        print()
+        print(f"{self.c.BOLD}📦 {'Archive (dry run)' if dry_run else 'Archive'}: logs before {cutoff}{self.c.RED}")
+        total_days = total_raw = total_packed = 0
+        for month, dates in months.items():
+            path = archive_path(base_dir, month)
+            try:
+                with contextlib.ExitStack() as locks:
+                    days = {}
+                    for date_str in dates:
+                        filepath = os.path.join(base_dir, f"{date_str}.md")
+                        locks.enter_context(LockedAppend(filepath))
+                        with open(filepath, "rb") as f:
+                            days[date_str] = f.read()
+
+                    cached = _open_archive(path)
+                    if cached:
+                        for date_str, info in cached[2].items():
+                            old = cached[1].read(info)
+                            new = days.get(date_str, b"")
+                            # 上次打包后没来得及删除原文件时，不重复追加
+                            days[date_str] = old if old.endswith(new) else old + new
+
+                    raw = sum(len(data) for data in days.values())
+                    if dry_run:
+                        print(f"  {month}  {len(dates):>3} 天待打包  {raw / 1024:>9.1f} KB")
+                        total_days += len(dates)
+                        total_raw += raw
+                        continue
+
+                    ensure_dir(os.path.dirname(path))
+                    tmp_path = f"{path}.{os.getpid()}.tmp"
+                    with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+                        for date_str in sorted(days):
+                            zf.writestr(f"{date_str}.md", days[date_str])
+                    with open(tmp_path, "rb") as f:
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, path)
+
+                    # 归档落盘后才删除原文件（仍持有锁，等锁的写入会重新创建文件）
+                    for date_str in dates:
+                        filepath = os.path.join(base_dir, f"{date_str}.md")
+                        os.remove(filepath)
+                        self._dedup_cache.pop(filepath, None)
+                        with contextlib.suppress(OSError):
+                            os.remove(self._dedup_sidecar(filepath))
+            except (OSError, zipfile.BadZipFile) as e:
+                print(f"{self.c.RED}❌ Error: Failed to archive {month} - {e}{self.c.RED}", file=sys.stderr)
+                return 1
+
+            packed = os.path.getsize(path)
+            total_days += len(dates)
+            total_raw += raw
+            total_packed += packed
+            print(f"  {month}  {len(dates):>3} 天  {raw / 1024:>9.1f} KB → {packed / 1024:>8.1f} KB")
+
+        print("-" * 40)
+        if dry_run:
+            print(f"📥 {total_days} day files ({total_raw / 1024:.1f} KB) would be archived")
+        else:
+            print(f"{self.c.GREEN}✅ Archived {total_days} day files into {len(months)} monthly bundles{self.c.RED}")
+            print(f"💾 {total_raw / 1024:.1f} KB → {total_packed / 1024:.1f} KB")
+        print(f"📂 Path:  {os.path.join(base_dir, ARCHIVE_DIR_NAME)}")
+        print(f"📍 Scope: {location_type.upper()}")
+        return 0
+
+
+class EntryParser:
+    """
+    增量条目解析器：标题行到来时产出上一条，最后一条由 flush 取出
+    iter_log_entries 一次喂入整个文件；tail -f 每次只喂入新追加的行
+    """
+
+    def __init__(self):
+        self._match_header = _regex(Logger.HEADER_PATTERN).match
+        self._current = None
+        self._detail = []
+
+    def feed(self, lines):
+        """解析一批行，逐条产出其中已完整的条目"""
+        match_header = self._match_header
+        current, detail = self._current, self._detail
+        try:
+            for line in lines:
+                if line.startswith("### "):
+                    if current:
+                        current["detail"] = "\n".join(detail).strip()
+                        yield current
+
+                    current = None
+                    detail = []
+                    m = match_header(line)
+                    if m:
+                        current = {
+                            "category": m.group("category").lower(),
+                            "title": m.group("title").strip(),
+                            "time": m.group("time") or "未知",
+                            "project": m.group("project") or "未知",
+                            "detail": "",
+                        }
+
+                elif current and line.startswith("> "):
+                    detail.append(line[2:].strip())
+        finally:
+            self._current, self._detail = current, detail
+
+    def flush(self):
+        """取出尚未结束的最后一条（没有时返回 None）"""
+        current = self._current
+        if current:
+            current["detail"] = "\n".join(self._detail).strip()
+        self._current, self._detail = None, []
+        return current
+
+
+class WriteQueue:
+    """
+    group-commit 写缓冲：条目先入队，后台线程等到时间窗口结束或攒够条数后
+    按目录成批追加并 fsync（每个文件一次）
+    进程崩溃时，队列中尚未写入的条目会丢失；close() 会写完剩余条目，
+    调用方忘记 close() 时由 atexit 在解释器正常退出前补上
+    """
+
+    def __init__(self, logger, window, max_entries):
+        import atexit
+        import threading
+
+        self.logger = logger
+        self.window = window
+        self.max_entries = max_entries
+        self._pending = []  # [(base_dir, record), ...]
+        self._keys = set()  # 队列中条目的 (base_dir, date, 防重哈希)
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()  # 保证批次按入队顺序写入
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="devlog-group-commit", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, base_dir, record):
+        """
+        入队；当天文件或队列中已有相同 (分类, 标题) 时不入队，返回 False
+        持有 _flush_lock 检查：条目要么仍在队列中，要么已写入文件，不会漏掉正在写入的批次
+        """
+        h = self.logger.dedup_hash(record["category"], record["title"])
+        key = (base_dir, record["date"], h)
+        filepath = os.path.join(base_dir, f"{record['date']}.md")
+        with self._flush_lock:
+            if os.path.exists(filepath) and h in self.logger._load_dedup_hashes(filepath):
+                return False
+            with self._cond:
+                if key in self._keys:
+                    return False
+                self._keys.add(key)
+                self._pending.append((base_dir, record))
+                self._cond.notify()
+        return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._pending) >= self.max_entries, timeout=self.window,
+                )
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def flush(self):
+        """把当前队列中的条目写入并 fsync"""
+        with self._flush_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+                self._keys = set()
+            groups = {}
+            for base_dir, record in batch:
+                groups.setdefault(base_dir, []).append(record)
+            for base_dir, records in groups.items():
+                try:
+                    self.logger.append_entries(base_dir, records, sync=True)
+                except IOError as e:
+                    print(f"❌ Error: Failed to write {len(records)} queued entries - {e}", file=sys.stderr)
+
+    def close(self):
+        import atexit
+
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        atexit.unregister(self.close)
+
+
+# ================= Tail =================
+class DayFollower:
+    """跟随一天的日志文件：记住已解析到的字节偏移，每次只读取并解析新追加的完整行"""
+
+    def __init__(self, base_dir, date_str):
+        self.date_str = date_str
+        self.filepath = os.path.join(base_dir, f"{date_str}.md")
+        self.offset = 0
+        self.inode = None
+        self.parser = EntryParser()
+
+    def poll(self):
+        """返回上次调用以来新追加的条目"""
+        try:
+            st = os.stat(self.filepath)
+        except FileNotFoundError:
+            return []
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            # 首次读取，或文件被替换 / 截断：从头开始
+            self.inode, self.offset, self.parser = st.st_ino, 0, EntryParser()
+        if st.st_size == self.offset:
+            return []
+
+        with open(self.filepath, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        if not end:
+            return []
+        self.offset += end
+
+        items = list(self.parser.feed(data[:end].decode("utf-8", errors="replace").splitlines(keepends=True)))
+        # 每次追加都是整条写入，读到行尾时最后一条已经完整
+        item = self.parser.flush()
+        if item:
+            items.append(item)
+        return items
+
+
+def _inotify_watch(path):
+    """Linux 上用 inotify 监听目录（文件追加、新建），返回 fd；不可用时返回 None（退回轮询）"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        # IN_MODIFY | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(fd, os.fsencode(path), 0x002 | 0x080 | 0x100) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
+def _wait_for_change(watch_fd, interval):
+    """等待目录变化（inotify）或 interval 秒；超时也返回，调用方借此检查是否跨过零点"""
+    if watch_fd is None:
+        time.sleep(interval)
+        return
+    import select
+
+    if select.select([watch_fd], [], [], interval)[0]:
+        try:
+            while os.read(watch_fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+
+# ================= Export =================
+EXPORT_FIELDS = ("date", "time", "category", "project", "title", "detail")
+
+
+def _export_jsonl(out, entries):
+    import json
+
+    count = 0
+    for date_str, item in entries:
+        row = dict(item, date=date_str)
+        out.write(json.dumps({field: row[field] for field in EXPORT_FIELDS}, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def _export_csv(out, entries):
+    import csv
+
+    writer = csv.writer(out)
+    writer.writerow(EXPORT_FIELDS)
+    count = 0
+    for date_str, item in entries:
+        writer.writerow([date_str] + [item[field] for field in EXPORT_FIELDS[1:]])
+        count += 1
+    return count
+
+
+def _export_html(out, entries):
+    from html import escape
+
+    out.write(
+        "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>devlog export</title>\n"
+        "<style>table{border-collapse:collapse}th,td{border:1px solid #ccc;padding:4px 8px;"
+        "vertical-align:top;text-align:left}</style>\n</head>\n<body>\n<table>\n<tr>"
+        + "".join(f"<th>{field}</th>" for field in EXPORT_FIELDS)
+        + "</tr>\n"
+    )
+    count = 0
+    for date_str, item in entries:
+        cells = [date_str] + [item[field] for field in EXPORT_FIELDS[1:]]
+        out.write("<tr>" + "".join(f"<td>{escape(cell).replace(chr(10), '<br>')}</td>" for cell in cells) + "</tr>\n")
+        count += 1
+    out.write("</table>\n</body>\n</html>\n")
+    return count
+
+
+# 每个 writer 从 (date_str, item) 迭代器逐条写出，返回条目数
+EXPORT_FORMATS = {"jsonl": _export_jsonl, "csv": _export_csv, "html": _export_html}
+
+
+def _parse_day_file(filepath):
+    """进程池 worker：解析单个日志文件（不读取配置）"""
+    return list(Logger(config=Config(auto_init=False)).iter_log_entries(filepath))
+
+
+def _parse_date(value):
+    """argparse 日期参数: YYYY-MM-DD"""
+    import argparse
+
+    try:
+        return datetime.datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}', expected YYYY-MM-DD")
+
+
+def _parse_month(value):
+    """argparse 月份参数: YYYY-MM"""
+    import argparse
+
+    try:
+        return datetime.datetime.strptime(value, "%Y-%m").strftime("%Y-%m")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid month '{value}', expected YYYY-MM")
+
+
+def parse_write_fast(argv):
+    """
+    写入命令快速解析，不加载 argparse
+    只接受 <category> <content> [-d DETAIL] [--here | --path DIR] [-v] [-f]，
+    其余情况（帮助、未知参数、缺参数等）返回 None 交给 argparse 处理
+    """
+    if len(argv) < 2 or argv[0] not in Logger.CATEGORIES or argv[1].startswith("-"):
+        return None
+
+    args = {
+        "mode": "write",
+        "category": argv[0],
+        "content": argv[1],
+        "detail": "",
+        "here": False,
+        "path": None,
+        "verbose": False,
+        "force": False,
+    }
+    rest = argv[2:]
+    i = 0
+    while i < len(rest):
+        arg = rest[i]
+        if arg in ("-d", "--detail", "--path") and i + 1 < len(rest):
+            args["path" if arg == "--path" else "detail"] = rest[i + 1]
+            i += 2
+            continue
+        if arg.startswith("--detail="):
+            args["detail"] = arg[len("--detail="):]
+        elif arg.startswith("--path="):
+            args["path"] = arg[len("--path="):]
+        elif arg == "--here":
+            args["here"] = True
+        elif arg in ("-v", "--verbose"):
+            args["verbose"] = True
+        elif arg in ("-f", "--force"):
+            args["force"] = True
+        else:
+            return None
+        i += 1
+
+    if args["here"] and args["path"] is not None:
+        return None  # 互斥参数，交给 argparse 报错
+    return args
+
+
+@profiled("args")
+def parse_arguments(argv=None):
     """解析命令行参数 - 支持简洁调用格式"""
-    import sys
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # 最常见的写入调用走快速路径
+    args = parse_write_fast(argv)
+    if args:
+        return args
+
+    import argparse
 
     # 检查是否是 list 命令
-    if len(sys.argv) > 1 and sys.argv[1] in ("list", "ls"):
+    if argv and argv[0] in ("list", "ls"):
         # 创建专门的 parser，只处理 list 相关参数
         parser = argparse.ArgumentParser(add_help=False)
         parser.add_argument("--here", action="store_true")
         parser.add_argument("--path")
+        parser.add_argument("--all", action="store_true")
+        parser.add_argument("--date", type=_parse_date)
+        parser.add_argument("-c", "--category", choices=list(Logger.CATEGORIES.keys()))
+        parser.add_argument("-p", "--project")
+        parser.add_argument("-n", "--limit", type=int)
+        parser.add_argument("--offset", type=int, default=0)
+        parser.add_argument("-r", "--reverse", action="store_true")
         # 只解析 --here 和 --path 之后的参数，跳过第一个 'list'
-        args, _ = parser.parse_known_args(sys.argv[2:])
-        return {"mode": "list", "here": args.here, "path": args.path}
+        args, _ = parser.parse_known_args(argv[1:])
+        return {
+            "mode": "list",
+            "here": args.here,
+            "path": args.path,
+            "all": args.all,
+            "date": args.date,
+            "category": args.category,
+            "project": args.project,
+            "limit": max(args.limit, 0) if args.limit is not None else None,  # 0 表示不限
+            "offset": max(args.offset, 0),
+            "reverse": args.reverse,
+        }
 
     # 检查是否是 weekly 命令
-    if len(sys.argv) > 1 and sys.argv[1] in ("weekly", "week"):
+    if argv and argv[0] in ("weekly", "week"):
         parser = argparse.ArgumentParser(add_help=False)
         parser.add_argument("--here", action="store_true")
         parser.add_argument("--path")
+        parser.add_argument("--all", action="store_true")
         parser.add_argument("-d", "--days", type=int, default=7)
-        args, _ = parser.parse_known_args(sys.argv[2:])
-        return {"mode": "weekly", "here": args.here, "path": args.path, "days": args.days}
+        args, _ = parser.parse_known_args(argv[1:])
+        return {"mode": "weekly", "here": args.here, "path": args.path, "all": args.all, "days": args.days}
+
+    # 检查是否是 report 命令（任意范围 / 月报 / 年报）
+    if argv and argv[0] == "report":
+        parser = argparse.ArgumentParser(prog="devlog report", add_help=False)
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument("--month", type=_parse_month)
+        group.add_argument("--year", type=int)
+        group.add_argument("--since", type=_parse_date)
+        parser.add_argument("--until", type=_parse_date)
+        parser.add_argument("-j", "--jobs", type=int)
+        parser.add_argument("--processes", action="store_true")
+        parser.add_argument("--here", action="store_true")
+        parser.add_argument("--path")
+        args, _ = parser.parse_known_args(argv[1:])
+        # --month / --year 已确定整个范围，再给 --until 会被悄悄忽略，直接报错
+        if args.until and (args.month or args.year):
+            parser.error("--until cannot be combined with --month or --year")
+
+        since, until = args.since, args.until
+        title = "📊 报 告 / Report"
+        if args.year:
+            since, until = f"{args.year:04d}-01-01", f"{args.year:04d}-12-31"
+            title = f"📊 {args.year} 年 报 / Yearly Report"
+        elif args.month or not (since or until):
+            import calendar
+
+            month = args.month or datetime.date.today().strftime("%Y-%m")
+            last_day = calendar.monthrange(int(month[:4]), int(month[5:]))[1]
+            since, until = f"{month}-01", f"{month}-{last_day:02d}"
+            title = f"📊 {month} 月 报 / Monthly Report"
+        return {
+            "mode": "report",
+            "since": since,
+            "until": until,
+            "title": title,
+            "jobs": args.jobs,
+            "processes": args.processes,
+            "here": args.here,
+            "path": args.path,
+        }
+
+    # 检查是否是 stats 命令
+    if argv and argv[0] == "stats":
+        parser = argparse.ArgumentParser(prog="devlog stats", add_help=False)
+        parser.add_argument("--since", type=_parse_date)
+        parser.add_argument("--until", type=_parse_date)
+        parser.add_argument("--top", type=int, default=10)
+        parser.add_argument("--here", action="store_true")
+        parser.add_argument("--path")
+        args, _ = parser.parse_known_args(argv[1:])
+        return {
+            "mode": "stats",
+            "since": args.since,
+            "until": args.until,
+            "top": args.top,
+            "here": args.here,
+            "path": args.path,
+        }
+
+    # 检查是否是 search 命令
+    if argv and argv[0] in ("search", "find"):
+        parser = argparse.ArgumentParser(prog="devlog search", add_help=False)
+        parser.add_argument("terms", nargs="+")
+        parser.add_argument("-c", "--category", choices=list(Logger.CATEGORIES.keys()))
+        parser.add_argument("-p", "--project")
+        parser.add_argument("--since", type=_parse_date)
+        parser.add_argument("-n", "--limit", type=int, default=50)
+        parser.add_argument("--here", action="store_true")
+        parser.add_argument("--path")
+        parser.add_argument("--all", action="store_true")
+        args, _ = parser.parse_known_args(argv[1:])
+        return {
+            "mode": "search",
+            "terms": args.terms,
+            "category": args.category,
+            "project": args.project,
+            "since": args.since,
+            "limit": args.limit,
+            "here": args.here,
+            "path": args.path,
+            "all": args.all,
+        }
+
+    # 检查是否是 import 命令
+    if argv and argv[0] == "import":
+        parser = argparse.ArgumentParser(prog="devlog import", add_help=False)
+        parser.add_argument("source", nargs="?", default="-")
+        parser.add_argument("--here", action="store_true")
+        parser.add_argument("--path")
+        args, _ = parser.parse_known_args(argv[1:])
+        return {"mode": "import", "source": args.source, "here": args.here, "path": args.path}
+
+    # 检查是否是 tail 命令
+    if argv and argv[0] == "tail":
+        parser = argparse.ArgumentParser(prog="devlog tail", add_help=False)
+        parser.add_argument("-f", "--follow", action="store_true")
+        parser.add_argument("-n", "--lines", type=int, default=10)
+        parser.add_argument("-c", "--category", choices=list(Logger.CATEGORIES.keys()))
+        parser.add_argument("-p", "--project")
+        parser.add_argument("--interval", type=float, default=1.0)
+        parser.add_argument("--here", action="store_true")
+        parser.add_argument("--path")
+        args, _ = parser.parse_known_args(argv[1:])
+        return {
+            "mode": "tail",
+            "follow": args.follow,
+            "lines": args.lines,
+            "category": args.category,
+            "project": args.project,
+            "interval": args.interval,
+            "here": args.here,
+            "path": args.path,
+        }
+
+    # 检查是否是 export 命令
+    if argv and argv[0] == "export":
+        parser = argparse.ArgumentParser(prog="devlog export", add_help=False)
+        parser.add_argument("-f", "--format", choices=list(EXPORT_FORMATS), default="jsonl")
+        parser.add_argument("--since", type=_parse_date)
+        parser.add_argument("--until", type=_parse_date)
+        parser.add_argument("-o", "--output")
+        parser.add_argument("--here", action="store_true")
+        parser.add_argument("--path")
+        args, _ = parser.parse_known_args(argv[1:])
+        return {
+            "mode": "export",
+            "format": args.format,
+            "since": args.since,
+            "until": args.until,
+            "output": args.output,
+            "here": args.here,
+            "path": args.path,
+        }
+
+    # 检查是否是 archive 命令
+    if argv and argv[0] == "archive":
+        parser = argparse.ArgumentParser(prog="devlog archive", add_help=False)
+        parser.add_argument("--older-than", type=int, default=30, metavar="DAYS")
+        parser.add_argument("--dry-run", action="store_true")
+        parser.add_argument("--here", action="store_true")
+        parser.add_argument("--path")
+        args, _ = parser.parse_known_args(argv[1:])
+        return {
+            "mode": "archive",
+            "older_than": args.older_than,
+            "dry_run": args.dry_run,
+            "here": args.here,
+            "path": args.path,
+        }
+
+    # 检查是否是 serve 命令（守护进程）
+    if argv and argv[0] == "serve":
+        parser = argparse.ArgumentParser(prog="devlog serve", add_help=False)
+        parser.add_argument("--socket")
+        args, _ = parser.parse_known_args(argv[1:])
+        return {"mode": "serve", "socket": args.socket}
 
     # 检查是否是配置命令
-    if len(sys.argv) > 1 and sys.argv[1] == "config":
-        if len(sys.argv) > 2 and sys.argv[2] in ("reset", "--reset", "-r"):
+    if argv and argv[0] == "config":
+        if len(argv) > 1 and argv[1] in ("reset", "--reset", "-r"):
             return {"mode": "config-reset"}
-        if len(sys.argv) > 2 and sys.argv[2] in ("show", "--show", "-s"):
+        if len(argv) > 1 and argv[1] in ("show", "--show", "-s"):
             return {"mode": "config-show"}
         return {"mode": "config-show"}
 
@@ -489,6 +2958,18 @@ Examples:
   dlog feat "点赞功能" --here
   dlog design "缓存策略" --path ~/custom/path
   dlog list --here
+  dlog list --date 2025-03-02 --category incident --reverse --limit 20
+  dlog tail -f --category incident
+  dlog weekly --all
+  dlog search 首页Crash --since 2025-03-01
+  dlog import tickets.jsonl
+  dlog serve
+  dlog weekly --profile
+  dlog report --month 2025-03
+  dlog report --since 2025-01-01 --until 2025-06-30 --jobs 8
+  dlog stats --since 2025-01-01
+  dlog export --format csv --since 2025-01-01 -o devlog.csv
+  dlog archive --older-than 90
   dlog config show
   dlog config reset
         """
@@ -500,8 +2981,9 @@ Examples:
     group.add_argument("--here", action="store_true", help="Save to ./.dlog (project level)")
     group.add_argument("--path", metavar="DIR", help="Save to custom directory")
     parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
+    parser.add_argument("-f", "--force", action="store_true", help="Skip the near-duplicate check")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     return {
         "mode": "write",
         "category": args.category,
@@ -510,12 +2992,428 @@ Examples:
         "here": args.here,
         "path": args.path,
         "verbose": args.verbose,
+        "force": args.force,
     }
 
 
+def run_command(args, logger):
+    """执行需要 Logger 的命令（CLI 与守护进程共用）"""
+    if args["mode"] == "list":
+        return logger.list_today(
+            args.get("here", False),
+            args.get("path"),
+            all_roots=args.get("all", False),
+            date_str=args.get("date"),
+            category=args.get("category"),
+            project=args.get("project"),
+            limit=args.get("limit"),
+            offset=args.get("offset", 0),
+            reverse=args.get("reverse", False)
+        )
+
+    if args["mode"] == "weekly":
+        return logger.generate_weekly(
+            days=args.get("days", 7),
+            use_current_dir=args.get("here", False),
+            custom_dir=args.get("path"),
+            all_roots=args.get("all", False)
+        )
+
+    if args["mode"] == "report":
+        return logger.generate_report(
+            since=args.get("since"),
+            until=args.get("until"),
+            title=args.get("title"),
+            jobs=args.get("jobs"),
+            processes=args.get("processes", False),
+            use_current_dir=args.get("here", False),
+            custom_dir=args.get("path")
+        )
+
+    if args["mode"] == "stats":
+        return logger.stats(
+            since=args.get("since"),
+            until=args.get("until"),
+            top=args.get("top", 10),
+            use_current_dir=args.get("here", False),
+            custom_dir=args.get("path")
+        )
+
+    if args["mode"] == "search":
+        return logger.search(
+            args["terms"],
+            category=args.get("category"),
+            project=args.get("project"),
+            since=args.get("since"),
+            limit=args.get("limit", 50),
+            use_current_dir=args.get("here", False),
+            custom_dir=args.get("path"),
+            all_roots=args.get("all", False)
+        )
+
+    if args["mode"] == "tail":
+        return logger.tail(
+            follow=args.get("follow", False),
+            lines=args.get("lines", 10),
+            category=args.get("category"),
+            project=args.get("project"),
+            interval=args.get("interval", 1.0),
+            use_current_dir=args.get("here", False),
+            custom_dir=args.get("path")
+        )
+
+    if args["mode"] == "export":
+        return logger.export(
+            fmt=args.get("format", "jsonl"),
+            since=args.get("since"),
+            until=args.get("until"),
+            output=args.get("output"),
+            use_current_dir=args.get("here", False),
+            custom_dir=args.get("path")
+        )
+
+    if args["mode"] == "archive":
+        return logger.archive(
+            older_than=args.get("older_than", 30),
+            dry_run=args.get("dry_run", False),
+            use_current_dir=args.get("here", False),
+            custom_dir=args.get("path")
+        )
+
+    if args["mode"] == "import":
+        return logger.import_entries(args["source"], args.get("here", False), args.get("path"))
+
+    # write mode
+    return logger.write(
+        args["category"],
+        args["content"],
+        args["detail"],
+        args.get("here", False),
+        args.get("path"),
+        force=args.get("force", False)
+    )
+
+
+# ================= Python API =================
+class DevLog:
+    """
+    进程内 Python API：供 Agent 等宿主程序直接记录和查询，不启动子进程、不打印、不交互
+
+        from devlog import DevLog
+
+        with DevLog() as log:
+            log.write("incident", "支付超时", detail="连接池耗尽")
+            log.write_many([{"category": "feat", "title": "点赞功能"}, ...])
+            for entry in log.iter_entries(since="2025-03-01", category="incident"):
+                print(entry["date"], entry["title"])
+            summary = log.weekly_summary()
+
+    log_dir 缺省为配置中的全局目录（配置不存在时为 ~/devlog，不会提示输入）；
+    durability 为 group-commit 时写入先入队，由后台线程批量落盘，close() 时写完
+    """
+
+    def __init__(self, log_dir=None, project=None):
+        self.logger = Logger(config=Config(auto_init=False))
+        self.base_dir, _ = self.logger.determine_path(False, log_dir)
+        self.project = project
+        self._queue = self.logger.enable_write_behind()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """写完排队中的条目并停止后台线程"""
+        self.logger.close()
+
+    def flush(self):
+        """立即写入排队中的条目"""
+        self.logger.flush()
+
+    def write(self, category, title, detail="", **fields):
+        """写入一条，fields 可含 date / time / project / force；返回值同 write_many"""
+        return self.write_many([dict(fields, category=category, title=title, detail=detail)])
+
+    def write_many(self, records, force=False):
+        """
+        批量写入，records 为 dict（字段同 devlog import 的 JSONL）
+        先全部校验，任一条非法时抛 ValueError 且不写入；每个日志文件只加锁、写入一次
+        返回 {"written": n, "skipped": n, "similar": n, "queued": n}：
+        skipped 为当天精确重复，similar 为近似重复（启用时），queued 为 group-commit 排队中的条目
+        """
+        normalized = []
+        for n, raw in enumerate(records):
+            if isinstance(raw, dict) and self.project and not raw.get("project"):
+                raw = dict(raw, project=self.project)
+            try:
+                normalized.append((self.logger.normalize_record(raw), force or raw.get("force", False)))
+            except ValueError as e:
+                raise ValueError(f"record {n}: {e}") from None
+
+        result = {"written": 0, "skipped": 0, "similar": 0, "queued": 0}
+        batch = []
+        for record, skip_check in normalized:
+            if not skip_check and self.logger.find_near_duplicate(self.base_dir, record):
+                result["similar"] += 1
+            else:
+                batch.append(record)
+
+        if self._queue:
+            for record in batch:
+                if self._queue.put(self.base_dir, record):
+                    result["queued"] += 1
+                else:
+                    result["skipped"] += 1
+            return result
+
+        written, skipped = self.logger.append_entries(
+            self.base_dir, batch, sync=self.logger.config.durability != "none",
+        )
+        result["written"], result["skipped"] = written, skipped
+        return result
+
+    def iter_entries(self, since=None, until=None, category=None, project=None):
+        """
+        按日期顺序逐条产出 dict: date / time / category / project / title / detail
+        since / until 为 YYYY-MM-DD（含）；category、project（可省略 @）为精确过滤
+        """
+        self.flush()
+        if project and not project.startswith("@"):
+            project = f"@{project}"
+        for date_str, item in self.logger.iter_entries(self.base_dir, since, until):
+            if (category and item["category"] != category) or (project and item["project"] != project):
+                continue
+            yield dict(item, date=date_str)
+
+    def weekly_summary(self, days=7):
+        """
+        最近 days 天的汇总（与 devlog weekly 相同的数据）
+        返回 {"since", "until", "dates": [有日志的日期（倒序）], "total": n,
+              "counts": {category: n}, "entries": {category: [entry, ...]}}
+        """
+        self.flush()
+        table, date_range = self.logger.collect_entries(self.base_dir, days)
+        today = datetime.date.today()
+        return {
+            "since": (today - datetime.timedelta(days=max(days - 1, 0))).strftime("%Y-%m-%d"),
+            "until": today.strftime("%Y-%m-%d"),
+            "dates": list(date_range),
+            "total": len(table),
+            "counts": table.category_counts(),
+            "entries": {
+                cat: [table.entry(i).as_dict() for i in rows]
+                for cat, rows in table.rows_by_category().items() if rows
+            },
+        }
+
+
+# ================= Daemon =================
+# 可转发给守护进程的命令（另加所有分类，即写入）
+DAEMON_COMMANDS = ("list", "ls", "weekly", "week", "report", "stats", "search", "find")
+# 守护进程读取单个请求的超时（秒）：客户端卡住时放弃该连接，不阻塞后续请求
+DAEMON_READ_TIMEOUT = 5
+# 随请求转发的环境变量（其余以守护进程启动时为准）
+DAEMON_ENV_KEYS = (
+    "DEVLOG_GLOBAL_DIR", "DEVLOG_INDEX", "DEVLOG_WORKSPACE_ROOTS", "DEVLOG_NEAR_DUP", "DEVLOG_DURABILITY",
+)
+
+
+def socket_path():
+    return os.environ.get("DEVLOG_SOCKET", SOCKET_FILE)
+
+
+def _recv_all(sock):
+    """读取直到对端关闭写端"""
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+class DevlogServer:
+    """
+    常驻守护进程
+    监听 Unix socket，复用同一个 Config / Logger（及其防重缓存）顺序处理请求
+    """
+
+    def __init__(self, path, logger):
+        self.path = path
+        self.logger = logger
+
+    def _is_alive(self):
+        """socket 文件存在时，判断是否已有守护进程在监听"""
+        import socket
+
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(self.path)
+            return True
+        except OSError:
+            return False
+
+    def serve_forever(self):
+        import signal
+        import socket
+
+        if os.path.exists(self.path):
+            if self._is_alive():
+                print(f"ℹ️  devlog daemon already running: {self.path}")
+                return 1
+            os.remove(self.path)  # 上次异常退出遗留
+
+        # SIGTERM 与 Ctrl+C 一样正常退出并清理 socket 文件
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.logger.enable_write_behind()
+        try:
+            server.bind(self.path)
+            os.chmod(self.path, 0o600)
+            server.listen(64)
+            print(f"🛰️  devlog daemon listening on {self.path} (Ctrl+C to stop)")
+            while True:
+                conn, _ = server.accept()
+                with conn:
+                    self._handle(conn)
+        except KeyboardInterrupt:
+            print()
+        finally:
+            server.close()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.logger.close()  # 退出前写完 group-commit 队列
+        return 0
+
+    def _handle(self, conn):
+        import json
+
+        conn.settimeout(DAEMON_READ_TIMEOUT)
+        try:
+            request = json.loads(_recv_all(conn).decode("utf-8"))
+        except (OSError, ValueError):
+            return
+        response = self.execute(request)
+        try:
+            conn.sendall(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+        except OSError:
+            pass
+
+    def execute(self, request):
+        """在请求方的 cwd 和环境变量下执行命令，捕获输出"""
+        import contextlib
+        import io
+
+        prev_cwd = os.getcwd()
+        prev_env = {key: os.environ.get(key) for key in DAEMON_ENV_KEYS}
+        try:
+            os.chdir(request["cwd"])
+        except (OSError, KeyError, TypeError):
+            return {"fallback": True}
+
+        out, err = io.StringIO(), io.StringIO()
+        try:
+            env = request.get("env") or {}
+            for key in DAEMON_ENV_KEYS:
+                if env.get(key) is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = env[key]
+
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                try:
+                    args = parse_arguments(request["argv"])
+                    self.logger.verbose = args.get("verbose", False)
+                    code = run_command(args, self.logger)
+                except SystemExit as e:
+                    code = e.code if isinstance(e.code, int) else 1
+                except Exception as e:  # 单个请求失败不能拖垮守护进程
+                    print(f"❌ Error: {e}", file=sys.stderr)
+                    code = 1
+        finally:
+            os.chdir(prev_cwd)
+            for key, value in prev_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+        return {"code": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+
+@profiled("forward")
+def forward_to_daemon(argv):
+    """
+    守护进程在运行时转发命令，返回退出码
+    未运行、不支持或连接失败时返回 None，由调用方在进程内执行
+    """
+    if os.environ.get("DEVLOG_NO_DAEMON"):
+        return None
+    if not argv or (argv[0] not in DAEMON_COMMANDS and argv[0] not in Logger.CATEGORIES):
+        return None
+    if "-h" in argv or "--help" in argv:
+        return None
+    path = socket_path()
+    if not os.path.exists(path):
+        return None
+
+    # 只有守护进程可能在运行时才付出导入开销
+    import json
+    import socket
+
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    request = {
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "env": {key: os.environ.get(key) for key in DAEMON_ENV_KEYS},
+    }
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(30)
+            sock.connect(path)
+            sock.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8"))
+            sock.shutdown(socket.SHUT_WR)
+            response = json.loads(_recv_all(sock).decode("utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    if response.get("fallback"):
+        return None
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    return response.get("code", 1)
+# ==========================================
+
+
 def main():
     """主入口"""
-    args = parse_arguments()
+    argv = sys.argv[1:]
+
+    # --profile 打印各阶段耗时；DEVLOG_PROFILE=path 追加 JSON 行便于汇总
+    sink = os.environ.get("DEVLOG_PROFILE")
+    if "--profile" in argv or sink:
+        PROFILER.start(show="--profile" in argv, sink=sink)
+        PROFILER.add("import", _IMPORT_SECONDS)
+        argv = [arg for arg in argv if arg != "--profile"]
+
+    code = _main(argv)
+    PROFILER.finish(code)
+    return code
+
+
+def _main(argv):
+    # 守护进程在运行时直接转发，省去配置加载等启动开销
+    code = forward_to_daemon(argv)
+    if code is not None:
+        PROFILER.command = f"forwarded:{argv[0]}"
+        return code
+
+    args = parse_arguments(argv)
+    PROFILER.command = args["mode"]
 
     # 配置命令不需要初始化 Logger
     if args["mode"] == "config-reset":
@@ -536,29 +3434,24 @@ def main():
         print()
         return 0
 
-    # 其他命令需要初始化 Logger（会触发首次配置）
+    # 其他命令需要初始化 Logger（首次读取配置时触发配置向导）
     config = Config()
     logger = Logger(verbose=args.get("verbose", False), config=config)
 
-    if args["mode"] == "list":
-        return logger.list_today(args.get("here", False), args.get("path"))
+    if args["mode"] == "serve":
+        import socket
 
-    if args["mode"] == "weekly":
-        return logger.generate_weekly(
-            days=args.get("days", 7),
-            use_current_dir=args.get("here", False),
-            custom_dir=args.get("path")
-        )
+        config.load()
+        if not hasattr(socket, "AF_UNIX"):
+            logger._print("Error: Unix domain sockets are not supported on this platform", logger.c.YELLOW)
+            return 1
+        return DevlogServer(args.get("socket") or socket_path(), logger).serve_forever()
+
+    return run_command(args, logger)
 
-    # write mode
-    return logger.write(
-        args["category"],
-        args["content"],
-        args["detail"],
-        args.get("here", False),
-        args.get("path")
-    )
 
+# 模块自身加载耗时（计入 profile 的 import 阶段）
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
 
 if __name__ == "__main__":
     sys.exit(main())